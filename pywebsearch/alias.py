@@ -1,6 +1,6 @@
 import re
 import gettext
-from PyQt6.QtWidgets import QMessageBox
+from pywebsearch.core.templates import TemplateError, compile_template
 
 _ = gettext.gettext
 
@@ -10,26 +10,30 @@ class AliasManager:
         self,
         dialogs,
         conf_path,
-        aliases,
         reload_func,
         platform_obj,
         config_obj,
-        default_alias,
         process_search_func,
         duck_func,
         history_manager,
     ):
         self.dialogs = dialogs
         self.conf_path = conf_path
-        self.aliases = aliases
         self.reload_config = reload_func
         self.platform = platform_obj
         self.config_obj = config_obj
-        self.default_alias = default_alias
         self.process_search_func = process_search_func
         self.duck_func = duck_func
         self.history_manager = history_manager
 
+    @property
+    def aliases(self):
+        return self.config_obj.snapshot().aliases
+
+    @property
+    def default_alias(self):
+        return self.config_obj.snapshot().default_alias
+
     def show_aliases(self):
         options = [
             _("DuckDuckGo ")
@@ -79,7 +83,7 @@ class AliasManager:
                     if not key_sanitized
                     else f"❌ {_('The key')} '{key_sanitized}' {_('already exists in the alias file.')}"
                 )
-                self.dialogs.show_message_box(msg, _("Error"), QMessageBox.Icon.Critical)
+                self.dialogs.show_message_box(msg, _("Error"), self.dialogs.Icon.Critical)
                 continue
             key = key_sanitized
             break
@@ -94,14 +98,15 @@ class AliasManager:
                 self.dialogs.show_message_box(
                     _("❌ Description cannot be empty."),
                     _("Error"),
-                    QMessageBox.Icon.Critical,
+                    self.dialogs.Icon.Critical,
                 )
                 continue
             break
 
         while True:
             template_text = (
-                _("⚙️ Enter the URL template with $query\n\n")
+                _("⚙️ Enter the URL template with $query\n")
+                + _("($1, $2... insert single words; ${query:path} encodes spaces as %20)\n\n")
                 + _("Examples:\n")
                 + "- https://example.com?q=$query\n"
                 + "- firefox 'https://example.com?q=$query'\n"
@@ -116,15 +121,25 @@ class AliasManager:
 
             if not template_stripped:
                 self.dialogs.show_message_box(
-                    _("❌ Template cannot be empty."), _("Error"), QMessageBox.Icon.Critical
+                    _("❌ Template cannot be empty."), _("Error"), self.dialogs.Icon.Critical
                 )
                 continue
 
-            if "$query" not in template:
+            try:
+                compiled = compile_template(template_stripped)
+            except TemplateError as e:
+                self.dialogs.show_message_box(
+                    _("❌ Invalid template: ") + str(e),
+                    _("Error"),
+                    self.dialogs.Icon.Critical,
+                )
+                continue
+
+            if not compiled.has_placeholders:
                 self.dialogs.show_message_box(
                     _("❌ Missing placeholder $query in the template."),
                     _("Error"),
-                    QMessageBox.Icon.Critical,
+                    self.dialogs.Icon.Critical,
                 )
                 continue
 
@@ -134,15 +149,19 @@ class AliasManager:
                     self.dialogs.show_message_box(
                         _("❌ The URL must be enclosed in single quotes\n➡️ chromium 'https://example.com/$query'"),
                         _("Error"),
-                        QMessageBox.Icon.Critical,
+                        self.dialogs.Icon.Critical,
                     )
                     continue
                 url_inside = match.group(1)
-                if "$query" not in url_inside or not (url_inside.startswith("http://") or url_inside.startswith("https://")):
+                try:
+                    url_ok = url_inside.startswith(("http://", "https://")) and compile_template(url_inside).has_placeholders
+                except TemplateError:
+                    url_ok = False
+                if not url_ok:
                     self.dialogs.show_message_box(
                         _("❌ The URL must start with http:// or https:// and contain $query\n➡️ chromium 'https://example.com/$query'"),
                         _("Error"),
-                        QMessageBox.Icon.Critical,
+                        self.dialogs.Icon.Critical,
                     )
                     continue
 
@@ -150,10 +169,9 @@ class AliasManager:
 
         if self.dialogs.show_yes_no_box(
             _(f'🔍 Preview:\n\n{key}="{template}" # {desc}\n\nSave this alias?'),
-            default_button=QMessageBox.StandardButton.Yes,
+            default_button=self.dialogs.StandardButton.Yes,
         ):
-            with open(self.conf_path, "a", encoding="utf-8") as f:
-                f.write(f'{key}="{template}" # {desc}\n')
+            self.config_obj.add_alias(key, template, desc)
             self.dialogs.show_message_box(_("✅ Alias saved successfully: ") + key)
             self.reload_config()
 
@@ -165,7 +183,7 @@ class AliasManager:
             self.dialogs.show_message_box(
                 _("Manually edit the file at:\n") + config_path,
                 _("Edit alias file"),
-                icon=QMessageBox.Icon.Information,
+                icon=self.dialogs.Icon.Information,
             )
 
     def set_default_alias(self):
@@ -182,18 +200,7 @@ class AliasManager:
         if key == "reset":
             self.reset_default_alias()
             return
-        with open(self.conf_path, "r+", encoding="utf-8") as f:
-            content = f.read()
-            f.seek(0)
-            f.truncate()
-            f.write(
-                re.sub(
-                    r"^default_alias=.*$",
-                    f'default_alias="{key}"',
-                    content,
-                    flags=re.MULTILINE,
-                )
-            )
+        self.config_obj.set_value("default_alias", key)
         self.dialogs.show_message_box(
             _("✅ Default alias updated to: ") + self.aliases[key]["desc"]
         )
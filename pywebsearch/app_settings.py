@@ -3,8 +3,9 @@ import gettext
 import sys
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QMessageBox, QFileDialog
-from pywebsearch.config import ConfigHandler
-from pywebsearch.history import HistoryManager
+from pywebsearch.core.config import ConfigHandler
+from pywebsearch.core.history import open_history
+from pywebsearch.core.bangs import BangIndex
 from pywebsearch.backup import backup_files, restore_files
 from pywebsearch.alias import AliasManager
 
@@ -30,35 +31,49 @@ class SettingsManager:
         self.hist_path = os.path.join(self.data_dir, "pywebsearch_history")
         self.backup_dir = os.path.join(self.data_dir, "backup")
 
+        self.created_config = False
         self.setup_directories()
 
-        self.config = ConfigHandler(self.conf_path)
-        self.history = HistoryManager(self.hist_path)
+        self.config = self._shared_config()
+        snapshot = self.config.snapshot()
+        self.history = open_history(self.hist_path, snapshot.history_backend, snapshot.history_max)
         self.pyweb_app.config = self.config
         self.pyweb_app.history = self.history
         self.pyweb_app.conf_path = self.conf_path
         self.pyweb_app.hist_path = self.hist_path
         self.pyweb_app.backup_dir = self.backup_dir
-        self.aliases = self.config.get_aliases()
-        self.pyweb_app.aliases = self.aliases
-        self.pyweb_app.default_alias = self.config.get_value("default_alias")
-        self.pyweb_app.default_browser = self.config.get_value("default_browser")
-        self.pyweb_app.cmd_prefix = self.config.get_value("cmd_prefix") or ">"
-        self.pyweb_app.alt_cmd_prefix = self.config.get_value("alt_cmd_prefix") or "@"
-        self.pyweb_app.alt_browser = self.config.get_value("alt_browser")
+        self.pyweb_app.bangs = BangIndex.open(self.data_dir)
+        self.pyweb_app.apply_config()
+        self.report_template_errors()
         self.alias_manager = AliasManager(
             self.dialogs,
             self.conf_path,
-            self.aliases,
-            self.reload_config,
+            self.apply_config,
             self.pyweb_app.platform,
             self.config,
-            self.pyweb_app.default_alias,
             self.pyweb_app.process_search,
             self.pyweb_app.duckduckgo_search,
             self.history,
         )
 
+    @property
+    def aliases(self):
+        return self.pyweb_app.aliases
+
+    def _shared_config(self):
+        # One handler (and so one snapshot) for the app, this manager, the
+        # alias manager and the platform helper.
+        platform = self.pyweb_app.platform
+        config = getattr(platform, "config", None)
+        if config is None or os.path.abspath(config.config_file) != os.path.abspath(self.conf_path):
+            config = ConfigHandler(self.conf_path)
+            if platform:
+                platform.attach_config(config)
+        elif self.created_config:
+            # The helper's handler was built before the default file existed
+            config.load()
+        return config
+
     def setup_directories(self):
         os.makedirs(self.config_dir, exist_ok=True)
         os.makedirs(self.data_dir, exist_ok=True)
@@ -69,19 +84,29 @@ class SettingsManager:
                 pass
         if not os.path.exists(self.conf_path):
             ConfigHandler(self.conf_path).create_default_config()
+            self.created_config = True
             self.dialogs.show_config_created(self.conf_path)
 
     def reload_config(self):
+        """Re-read the config file (it may have been edited outside the app)."""
         self.config.load()
-        self.aliases = self.config.get_aliases()
-        self.pyweb_app.aliases = self.aliases
-        self.pyweb_app.default_alias = self.config.get_value("default_alias")
-        self.pyweb_app.default_browser = self.config.get_value("default_browser")
-        self.pyweb_app.cmd_prefix = self.config.get_value("cmd_prefix") or ">"
-        self.pyweb_app.alt_cmd_prefix = self.config.get_value("alt_cmd_prefix") or "@"
-        self.pyweb_app.alt_browser = self.config.get_value("alt_browser")
-        self.pyweb_app.reload_config()
-        self.alias_manager.aliases = self.aliases
+        self.apply_config()
+
+    def apply_config(self):
+        """Apply the handler's in-memory state after one of our own writes."""
+        if self.pyweb_app.apply_config():
+            self.report_template_errors()
+
+    def report_template_errors(self):
+        errors = self.pyweb_app.router.errors
+        if not errors:
+            return
+        details = "\n".join(f"• {key}: {message}" for key, message in errors.items())
+        self.dialogs.show_message_box(
+            _("⚠️ These aliases were ignored because their template is invalid:\n\n") + details,
+            _("Invalid aliases"),
+            icon=QMessageBox.Icon.Warning,
+        )
 
     def show_aliases(self):
         self.alias_manager.show_aliases()
@@ -134,7 +159,7 @@ class SettingsManager:
             # Valid prefix, save and exit
             self.config.set_value("cmd_prefix", new_prefix)
             self.dialogs.show_message_box(_("✅ Prefix updated to: ") + new_prefix)
-            self.reload_config()
+            self.apply_config()
             break
 
     def set_default_browser(self):
@@ -154,7 +179,7 @@ class SettingsManager:
         self.dialogs.show_message_box(
             _("✅ Default browser updated to: ") + new_browser
         )
-        self.reload_config()
+        self.apply_config()
 
     def set_alt_browser(self):
         current = self.pyweb_app.alt_browser or ""
@@ -168,7 +193,7 @@ class SettingsManager:
             return
         self.config.set_value("alt_browser", new_browser)
         self.dialogs.show_message_box(_("✅ Alternative browser updated to: ") + new_browser)
-        self.reload_config()
+        self.apply_config()
 
     def set_alt_cmd_prefix(self):
         current = self.pyweb_app.alt_cmd_prefix or "@"
@@ -208,7 +233,7 @@ class SettingsManager:
             # Valid prefix, save and exit
             self.config.set_value("alt_cmd_prefix", new_prefix)
             self.dialogs.show_message_box(_("✅ Alternative command prefix updated to: ") + new_prefix)
-            self.reload_config()
+            self.apply_config()
             break
 
     def backup_config(self):
@@ -223,6 +248,9 @@ class SettingsManager:
         if not selection:
             return
         selected_option = options_map[selection - 1][0]
+        if hasattr(self.history, "export_text"):
+            # SQLite history: back up its entries in the usual text format
+            self.history.export_text(self.hist_path)
         files_map = {
             _("⚙️ Aliases (pywebsearch.conf)"): [self.pyweb_app.conf_path],
             _("🕘 History (pywebsearch_history)"): [self.pyweb_app.hist_path],
@@ -286,6 +314,8 @@ class SettingsManager:
             restore_files(os.path.dirname(conf_path), [self.pyweb_app.conf_path])
         if restore_hist:
             restore_files(os.path.dirname(hist_path), [self.pyweb_app.hist_path])
+            if hasattr(self.history, "import_text"):
+                self.history.import_text(self.pyweb_app.hist_path, replace=True)
 
         messages = []
         if restore_conf:
@@ -296,17 +326,16 @@ class SettingsManager:
         self.dialogs.show_message_box("\n".join(messages))
 
     def view_history(self):
-        if not os.path.exists(self.hist_path) or os.path.getsize(self.hist_path) == 0:
-            self.dialogs.show_message_box(_("ℹ️ No search history available yet."))
-            return
-        with open(self.hist_path, "r", encoding="utf-8") as f:
-            history = [line.strip() for line in f if line.strip()]
-        if not history:
+        if not len(self.history):
             self.dialogs.show_message_box(_("ℹ️ No search history available yet."))
             return
-        history.reverse()
+        # Rows are fetched from the history as the list scrolls; an indexed
+        # store (SQLite) also answers the filter itself
         selected = self.dialogs.show_searchable_list_dialog(
-            _("Search history"), _("Select a previous search:"), history
+            _("Search history"),
+            _("Select a previous search:"),
+            self.history.iter_recent(),
+            search=getattr(self.history, "search", None),
         )
         if selected:
             self.pyweb_app.process_search(selected, history_manager=self.history)
@@ -315,7 +344,7 @@ class SettingsManager:
         if self.dialogs.show_yes_no_box(
             _("Are you sure you want to clear the search history?")
         ):
-            open(self.hist_path, "w", encoding="utf-8").close()
+            self.history.clear_history()
             self.dialogs.show_message_box(_("✅ Search history cleared successfully."))
 
     def open_url_dialog(self):
@@ -359,7 +388,7 @@ class SettingsManager:
             list(new_browsers)
         )
         if chosen:
-            existing = self.config.get_value("extra_browsers").split(",")
+            existing = list(self.config.snapshot().extra_browsers)
             updated = set(existing) | {chosen}
             safe_updated = [b for b in updated if self.pyweb_app.platform.is_browser_name_safe(b)]
             self.config.set_value("extra_browsers", ",".join(safe_updated))
@@ -382,6 +411,7 @@ class SettingsManager:
 🔎 <b>alias:query:</b> Use your custom aliases.
    Example: <code>g:mechanical keyboard</code> — Google search
    Example: <code>w:Linux</code> — Wikipedia search
+   Example: <code>g+so+gh:segfault</code> — several aliases at once
 
 🌐 <b>>url:</b> Open a URL directly in your browser.
    Example: <code>>github.com</code>
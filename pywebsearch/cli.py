@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Command line entry point.
+
+Queries given on the command line are resolved and launched headless, using
+only ConfigHandler, HistoryManager and PyWebSearchApp, so PyQt6 is never
+imported for scripted use. Without a query the GUI is started.
+"""
+
+import os
+import sys
+import time
+import gettext
+
+# Imported first: its load time is the origin of the "import" span
+from pywebsearch.core import trace
+from pywebsearch.core.bangs import BangIndex
+from pywebsearch.core.config import ConfigHandler
+from pywebsearch.core.history import open_history
+from pywebsearch.core.search import PyWebSearchApp
+
+_imported_at = time.perf_counter()
+
+# Locale language
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+locales_dir = os.path.join(script_dir, "locales")
+translation = gettext.translation("pywebsearch", locales_dir, fallback=True)
+_ = translation.gettext
+
+HELP_TEXT = """pywebsearch - Custom web search tool
+Usage:
+pywebsearch [options] [query] [options]
+
+Options:
+--help, -h            Show this help and exit.
+--verbose             Verbose mode (show executed commands).
+--                    Treat the words after it as the query, even if
+                      they look like options.
+--profile[=FILE]      Write timings of startup and launch stages as JSON
+                      lines to FILE (default: stderr). Setting the
+                      PYWEBSEARCH_PROFILE environment variable does the same.
+--resolve [FILE]      Resolve queries from FILE (or stdin) to URLs without
+                      launching anything, one record per line.
+--format jsonl|tsv    Output format for --resolve (default: jsonl).
+
+Examples:
+pywebsearch --help
+pywebsearch '!g mechanical keyboard'
+pywebsearch '>github.com'
+pywebsearch 'g:cockatoo'
+pywebsearch --resolve queries.txt --format tsv
+"""
+
+
+def get_platform_helper():
+    """Return an instance of the platform helper for the running system."""
+    if sys.platform == "win32":
+        from pywebsearch.windows import WindowsHelper as platform_mod
+    else:
+        from pywebsearch.linux import LinuxHelper as platform_mod
+    return platform_mod()
+
+
+def get_app_paths(platform_helper):
+    """Return (conf_path, hist_path, data_dir), creating the directories."""
+    config_dir, data_dir = platform_helper.get_platform_dirs()
+    os.makedirs(config_dir, exist_ok=True)
+    os.makedirs(data_dir, exist_ok=True)
+    conf_path = os.path.join(config_dir, "pywebsearch.conf")
+    hist_path = os.path.join(data_dir, "pywebsearch_history")
+    return conf_path, hist_path, data_dir
+
+
+def load_config(conf_path):
+    config = ConfigHandler(conf_path)
+    if not os.path.exists(conf_path):
+        config.create_default_config()
+        config.load()
+    return config
+
+
+def create_headless_app(platform_helper=None):
+    """
+    Build a PyWebSearchApp wired to the user's config and history files
+    without touching any GUI code.
+    """
+    if platform_helper is None:
+        platform_helper = get_platform_helper()
+    conf_path, hist_path, data_dir = get_app_paths(platform_helper)
+
+    config = load_config(conf_path)
+    snapshot = config.snapshot()
+    history = open_history(hist_path, snapshot.history_backend, snapshot.history_max)
+    platform_helper.attach_config(config)
+
+    pyweb_app = PyWebSearchApp(platform_module=platform_helper)
+    pyweb_app.platform_helper = platform_helper
+    pyweb_app.config = config
+    pyweb_app.history = history
+    pyweb_app.conf_path = conf_path
+    pyweb_app.hist_path = hist_path
+    pyweb_app.backup_dir = os.path.join(data_dir, "backup")
+    pyweb_app.bangs = BangIndex.open(data_dir)
+    pyweb_app.apply_config()
+    report_template_errors(pyweb_app.router)
+    return pyweb_app
+
+
+def report_template_errors(router):
+    for key, message in router.errors.items():
+        print(f"pywebsearch: ignoring alias '{key}': {message}", file=sys.stderr)
+
+
+def run_query(query, pyweb_app=None, verbose=False):
+    """Resolve and launch a single query without a GUI."""
+    if pyweb_app is None:
+        pyweb_app = create_headless_app()
+    pyweb_app.verbose = verbose
+    pyweb_app.process_search(query, history_manager=pyweb_app.history)
+
+
+def run_batch(source="-", fmt="jsonl"):
+    """Resolve queries from a file (or stdin for '-') and print the records."""
+    from pywebsearch.core.batch import resolve_stream
+    from pywebsearch.core.router import QueryRouter
+
+    conf_path, _hist_path, data_dir = get_app_paths(get_platform_helper())
+    router = QueryRouter.from_config(load_config(conf_path), bangs=BangIndex.open(data_dir))
+    report_template_errors(router)
+    if source == "-":
+        resolve_stream(router, sys.stdin, sys.stdout, fmt)
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            resolve_stream(router, f, sys.stdout, fmt)
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    verbose = False
+
+    if args and args[0] in ("--help", "-h"):
+        print(_(HELP_TEXT))
+        sys.exit(0)
+
+    # Options may come before or after the query words; "--" ends them
+    words = []
+    query_only = False
+    while args:
+        option = args.pop(0)
+        if option == "--":
+            query_only = not words
+            words.extend(args)
+            break
+        if option == "--verbose":
+            verbose = True
+        elif option.split("=", 1)[0] == "--profile":
+            trace.enable(option.partition("=")[2] or "-")
+        else:
+            words.append(option)
+    args = words
+    trace.record("import", trace.ORIGIN, _imported_at, module="pywebsearch.cli")
+
+    if args and args[0] == "--resolve" and not query_only:
+        args.pop(0)
+        fmt = "jsonl"
+        if "--format" in args:
+            i = args.index("--format")
+            fmt = args[i + 1] if i + 1 < len(args) else ""
+            del args[i:i + 2]
+        try:
+            run_batch(args[0] if args else "-", fmt)
+        except (OSError, ValueError) as e:
+            print(f"pywebsearch: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
+    if args:
+        run_query(" ".join(args), verbose=verbose)
+        sys.exit(0)
+
+    # No query: fall back to the full GUI
+    with trace.span("import", module="pywebsearch.main"):
+        from pywebsearch import main as gui
+    gui.run_gui(verbose=verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Thin client for the pywebsearch daemon.
+
+Forwards a query over the daemon's Unix domain socket and returns as soon as
+the daemon has accepted it. Only the standard library socket module is
+imported on this path; if no daemon is listening, or it refused the query,
+the query is run headless. Once the query has been sent it is never run
+locally as well: a daemon that does not answer in time may be running it.
+"""
+
+import os
+import socket
+import stat
+import sys
+
+PROTOCOL_OK = b"OK"
+
+
+def get_socket_path():
+    """Return the per-user socket path shared by the daemon and the client."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "pywebsearch.sock")
+    return os.path.join("/tmp", f"pywebsearch-{os.getuid()}.sock")
+
+
+def is_own_socket(path):
+    """
+    True if path is a socket owned by the current user. The /tmp fallback
+    path is predictable, so anything else there may belong to someone else.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def send_query(query, socket_path=None, timeout=2.0):
+    """
+    Hand a query to a running daemon.
+    Returns True once the query was sent, False if no daemon took it (none
+    listening, or it answered with an error).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    path = socket_path or get_socket_path()
+    if not is_own_socket(path):
+        return False
+    payload = query.replace("\n", " ").strip().encode("utf-8") + b"\n"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+            sock.sendall(payload)
+        except OSError:
+            return False
+        try:
+            reply = sock.recv(64)
+        except OSError:
+            reply = b""
+    if reply and not reply.startswith(PROTOCOL_OK):
+        return False
+    if not reply:
+        print("pywebsearch-send: the daemon did not acknowledge the query; not running it again.",
+              file=sys.stderr)
+    return True
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] in ("--help", "-h"):
+        print("Usage: pywebsearch-send QUERY\n"
+              "Send QUERY to a running pywebsearch daemon (pywebsearchd).")
+        sys.exit(0 if args else 1)
+
+    query = " ".join(args)
+    if send_query(query):
+        sys.exit(0)
+
+    # No daemon listening: resolve the query in this process instead
+    from pywebsearch.cli import run_query
+    run_query(query)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Automatic config reload for the GUI.
+
+QFileSystemWatcher (inotify on Linux) watches the config file and its
+directory; the directory is needed because most editors save by writing a
+new file and renaming it over the old one, which drops the file watch.
+Events are debounced and then checked with a single stat against the
+signature the ConfigHandler recorded, so the file is only re-read when its
+inode, size or mtime changed. If the platform refuses the watch, the same
+stat check runs on a slow timer instead.
+"""
+
+import os
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer
+
+DEBOUNCE_MS = 300
+POLL_INTERVAL_MS = 2000
+
+
+class ConfigWatcher(QObject):
+    def __init__(self, config, on_reload, parent=None, verbose=False):
+        super().__init__(parent)
+        self.config = config
+        self.on_reload = on_reload
+        self.verbose = verbose
+        self.path = os.path.abspath(config.config_file)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.check)
+
+        self._poll = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+        watched = self._watcher.addPath(os.path.dirname(self.path))
+        self._watch_file()
+        if not watched:
+            self._start_polling()
+
+    def _watch_file(self):
+        # Re-added after every event: a rename over the file drops the watch
+        if os.path.exists(self.path) and self.path not in self._watcher.files():
+            self._watcher.addPath(self.path)
+
+    def _start_polling(self):
+        if self.verbose:
+            print("[ConfigWatcher] File watching unavailable, polling instead")
+        self._poll = QTimer(self)
+        self._poll.setInterval(POLL_INTERVAL_MS)
+        self._poll.timeout.connect(self.check)
+        self._poll.start()
+
+    def _schedule(self, _path=None):
+        self._debounce.start()
+
+    def check(self):
+        """Reload and notify if the file changed; returns True if it did."""
+        self._watch_file()
+        if not self.config.reload_if_changed():
+            return False
+        if self.verbose:
+            print(f"[ConfigWatcher] {self.path} changed, reloaded")
+        self.on_reload()
+        return True
+
+    def stop(self):
+        self._debounce.stop()
+        if self._poll is not None:
+            self._poll.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
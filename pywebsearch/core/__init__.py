@@ -0,0 +1,12 @@
+"""
+Qt-free core of pywebsearch: config parsing, alias resolution, history and
+launching. Nothing in this package imports PyQt6, so scripts, daemons and
+tests can use the search engine without loading a GUI toolkit.
+"""
+
+from pywebsearch.core.config import ConfigHandler
+from pywebsearch.core.history import HistoryManager
+from pywebsearch.core.platform_base import PlatformHelper
+from pywebsearch.core.search import PyWebSearchApp
+
+__all__ = ["ConfigHandler", "HistoryManager", "PlatformHelper", "PyWebSearchApp"]
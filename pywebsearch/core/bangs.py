@@ -0,0 +1,185 @@
+"""
+Offline !bang resolution.
+
+If a DuckDuckGo bang dump (the JSON list served at duckduckgo.com/bang.js,
+entries with "t" trigger, "u" URL template and "d" domain) is placed in the
+data directory as bangs.json, it is compiled once into bangs.idx: a header,
+a table of record offsets and the records sorted by trigger. The index is
+memory-mapped on first use and searched with a binary search, so opening it
+costs a couple of stat calls and nothing is parsed at startup. The index is
+rebuilt automatically when bangs.json changes.
+"""
+
+import json
+import mmap
+import os
+import struct
+from urllib.parse import quote, quote_plus
+
+BANGS_FILE = "bangs.json"
+INDEX_FILE = "bangs.idx"
+
+MAGIC = b"PWSBANG1"
+# magic, source size, source mtime_ns, record count
+HEADER = struct.Struct("<8sQqI")
+OFFSET = struct.Struct("<I")
+SEP = b"\x1f"
+PLACEHOLDER = "{{{s}}}"
+
+
+def _clean(value):
+    return str(value or "").replace("\x1f", "").replace("\n", "").strip()
+
+
+def build_index(json_path, index_path):
+    """Compile a bang JSON dump into the on-disk index. Returns the entry count."""
+    st = os.stat(json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    records = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        trigger = _clean(entry.get("t")).lower()
+        url = _clean(entry.get("u"))
+        if trigger and url:
+            records.setdefault(trigger.encode("utf-8"), (_clean(entry.get("d")), url))
+
+    blob = bytearray()
+    offsets = []
+    for trigger in sorted(records):
+        domain, url = records[trigger]
+        offsets.append(len(blob))
+        blob += trigger + SEP + domain.encode("utf-8") + SEP + url.encode("utf-8") + b"\n"
+
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, len(offsets)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(blob)
+    os.replace(tmp_path, index_path)
+    return len(offsets)
+
+
+def _index_is_current(json_path, index_path):
+    try:
+        st = os.stat(json_path)
+        with open(index_path, "rb") as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return False
+    if len(header) != HEADER.size:
+        return False
+    magic, size, mtime_ns, _count = HEADER.unpack(header)
+    return magic == MAGIC and size == st.st_size and mtime_ns == st.st_mtime_ns
+
+
+class BangIndex:
+    """Read-only view of a compiled bang index, mapped lazily on first lookup."""
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self._map = None
+        self._count = 0
+        self._records_start = 0
+
+    @classmethod
+    def open(cls, data_dir):
+        """
+        Return a BangIndex for data_dir, rebuilding the index if bangs.json is
+        newer. Returns None when no bang list is installed or it is unreadable.
+        """
+        json_path = os.path.join(data_dir, BANGS_FILE)
+        index_path = os.path.join(data_dir, INDEX_FILE)
+        if os.path.exists(json_path):
+            if not _index_is_current(json_path, index_path):
+                try:
+                    build_index(json_path, index_path)
+                except (OSError, ValueError):
+                    return None
+        elif not os.path.exists(index_path):
+            return None
+        return cls(index_path)
+
+    def _ensure_open(self):
+        if self._map is not None:
+            return True
+        try:
+            with open(self.index_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        magic, _size, _mtime_ns, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            return False
+        self._records_start = HEADER.size + self._count * OFFSET.size
+        return True
+
+    def __len__(self):
+        return self._count if self._ensure_open() else 0
+
+    def _record(self, i):
+        start = self._records_start + OFFSET.unpack_from(self._map, HEADER.size + i * OFFSET.size)[0]
+        end = self._map.find(b"\n", start)
+        return self._map[start:end].split(SEP)
+
+    def lookup(self, trigger):
+        """Return (domain, url_template) for a trigger such as 'w', or None."""
+        if not self._ensure_open():
+            return None
+        key = trigger.lower().encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._records_start + OFFSET.unpack_from(
+                self._map, HEADER.size + mid * OFFSET.size
+            )[0]
+            current = self._map[start:self._map.find(SEP, start)]
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                _trigger, domain, url = self._record(mid)
+                return domain.decode("utf-8"), url.decode("utf-8")
+        return None
+
+    def resolve(self, query):
+        """
+        Return the target URL for a query containing a known !bang as its
+        first or last word, or None to let DuckDuckGo handle it.
+        """
+        words = query.split()
+        if not words:
+            return None
+        if words[0].startswith("!") and len(words[0]) > 1:
+            bang, terms = words[0], words[1:]
+        elif words[-1].startswith("!") and len(words[-1]) > 1:
+            bang, terms = words[-1], words[:-1]
+        else:
+            return None
+
+        found = self.lookup(bang[1:])
+        if found is None:
+            return None
+        domain, template = found
+        if template.startswith("/"):
+            # DuckDuckGo's own bangs (images, maps...) are site-relative
+            template = "https://duckduckgo.com" + template
+        terms = " ".join(terms)
+        if not terms and domain:
+            return f"https://{domain}"
+        # Query-string placeholders take '+' for spaces, path ones need %20
+        query_start = template.find("?")
+        if 0 <= query_start < template.find(PLACEHOLDER):
+            encoded = quote_plus(terms)
+        else:
+            encoded = quote(terms, safe="")
+        return template.replace(PLACEHOLDER, encoded)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
@@ -0,0 +1,57 @@
+"""
+Batch resolution: turn a stream of queries into URLs or commands without
+launching anything.
+
+Each input line is resolved by the same QueryRouter as PyWebSearchApp, so
+prefixes, the alt prefix, aliases, the default alias and the DuckDuckGo
+fallback behave exactly as in interactive use. The resolved actions are
+written out one record per line instead of being launched. Input is consumed
+as a stream, so memory use does not grow with the number of queries.
+"""
+
+import json
+
+FORMATS = ("jsonl", "tsv")
+
+
+def resolve_query(router, query):
+    """
+    Return a list of (kind, target, browser) for a query: one entry per
+    launch, so several for fan-out queries (g+so:query) and none for empty
+    input.
+    """
+    action = router.resolve(query)
+    if action is None:
+        return []
+    actions = action.children if action.kind == "group" else (action,)
+    return [(a.kind, a.target, a.browser) for a in actions]
+
+
+def format_record(query, resolved, fmt="jsonl"):
+    kind, target, browser = resolved
+    if fmt == "tsv":
+        fields = (query, kind, browser, target)
+        return "\t".join(f.replace("\t", " ") for f in fields)
+    return json.dumps(
+        {"query": query, "type": kind, "browser": browser, "target": target},
+        ensure_ascii=False,
+    )
+
+
+def resolve_stream(router, lines, out, fmt="jsonl"):
+    """
+    Resolve every line of `lines` with a QueryRouter (compiled once for the
+    run) and write one record per launch to `out`. Blank lines are skipped.
+    Returns the number of records written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown batch format: {fmt}")
+    count = 0
+    for line in lines:
+        query = line.strip()
+        if not query:
+            continue
+        for resolved in resolve_query(router, query):
+            out.write(format_record(query, resolved, fmt) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,320 @@
+"""
+Frecency-ranked inline completion for the search box.
+
+Candidates are the history entries plus "alias:" for every alias, ranked
+by frecency: each use counts 2 ** (-age / HALF_LIFE), age being the number
+of searches made since. Scores are kept as logarithms of the weight of
+each use relative to the first search (use t weighs 2 ** (t / HALF_LIFE)),
+so time passing never changes their order and nothing has to be decayed
+again: a search only adds one term to the scores of what it used.
+
+FrecencyIndex keeps the lowercase candidates sorted, split in blocks of
+about BLOCK_SIZE that each remember their best candidate. The candidates
+for a prefix are a bisect away, and their best is found from the blocks
+the prefix covers entirely plus the two partial blocks at its ends, so a
+keystroke costs about the same for short and long prefixes. Inserting a
+candidate only touches its block, and a higher score only its block's
+best. The answer for each prefix asked for is cached too; as scores only
+ever grow, a search keeps the cache exact by checking the prefixes of
+what it used.
+"""
+
+import bisect
+import math
+import threading
+from itertools import islice
+
+from pywebsearch.core import trace
+
+# Searches after which a use counts half as much
+HALF_LIFE = 200
+DECAY = math.log(2) / HALF_LIFE
+# Candidates per block; a block twice this size is split
+BLOCK_SIZE = 512
+# Cached prefixes kept before the cache is dropped
+CACHE_MAX = 4096
+
+NO_USES = float("-inf")
+_MISSING = object()
+
+
+def _log_add(a, b):
+    # log(exp(a) + exp(b)) without leaving log space
+    if a < b:
+        a, b = b, a
+    if b == NO_USES:
+        return a
+    return a + math.log1p(math.exp(b - a))
+
+
+class FrecencyIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks = []   # sorted lowercase candidates, in sorted blocks
+        self._firsts = []   # first key of each block
+        self._tops = []     # best key of each block
+        self._text = {}     # key -> candidate as last used
+        self._score = {}    # key -> log frecency
+        self._best = {}     # prefix -> best key longer than it ("" for none)
+        self.clock = 0      # searches recorded so far
+
+    def load(self, uses, related=None):
+        """
+        Replace the contents with `uses`, an iterable of (text, count) for
+        each search, oldest first, giving text count uses at that point.
+        related(text) may name another candidate credited with the same
+        uses (e.g. the alias of an entry), or return None.
+        """
+        score = {}
+        text = {}
+        credits = {}
+        clock = 0
+        for candidate, count in uses:
+            clock += 1
+            weight = DECAY * clock
+            if count > 1:
+                weight += math.log(count)
+            key = candidate.lower()
+            old = score.get(key)
+            score[key] = weight if old is None else _log_add(old, weight)
+            text[key] = candidate
+            if related is not None:
+                other = related(candidate)
+                if other is not None:
+                    credits.setdefault(other, []).append(weight)
+        for other, weights in credits.items():
+            # log(sum(exp(w))) of all the uses at once
+            key = other.lower()
+            top = max(weights)
+            total = math.fsum(math.exp(w - top) for w in weights)
+            score[key] = _log_add(score.get(key, NO_USES), top + math.log(total))
+            text.setdefault(key, other)
+        keys = sorted(score)
+        blocks = [keys[i:i + BLOCK_SIZE] for i in range(0, len(keys), BLOCK_SIZE)]
+        with self._lock:
+            self._blocks = blocks
+            self._firsts = [block[0] for block in blocks]
+            self._tops = [max(block, key=score.__getitem__) for block in blocks]
+            self._text, self._score, self._best = text, score, {}
+            self.clock = clock
+
+    def __len__(self):
+        return len(self._score)
+
+    def use(self, *texts):
+        """Record one search that used each of texts."""
+        with self._lock:
+            self.clock += 1
+            weight = DECAY * self.clock
+            for text in texts:
+                key = text.lower()
+                old = self._score.get(key)
+                score = self._score[key] = weight if old is None else _log_add(old, weight)
+                self._text[key] = text
+                if old is None:
+                    self._insert(key)
+                else:
+                    b = self._block_of(key)
+                    if score > self._score[self._tops[b]]:
+                        self._tops[b] = key
+                self._promote(key, score)
+
+    def add(self, text):
+        """Make text a candidate, without uses unless it already had some."""
+        key = text.lower()
+        with self._lock:
+            if key in self._score:
+                return
+            self._score[key] = NO_USES
+            self._text[key] = text
+            self._insert(key)
+            self._promote(key, NO_USES)
+
+    def remove(self, text):
+        key = text.lower()
+        with self._lock:
+            if key not in self._score:
+                return
+            b = self._block_of(key)
+            block = self._blocks[b]
+            del block[bisect.bisect_left(block, key)]
+            if not block:
+                del self._blocks[b], self._firsts[b], self._tops[b]
+            else:
+                self._firsts[b] = block[0]
+                if self._tops[b] == key:
+                    self._tops[b] = max(block, key=self._score.__getitem__)
+            del self._score[key]
+            del self._text[key]
+            for n in range(1, len(key)):
+                if self._best.get(key[:n]) == key:
+                    del self._best[key[:n]]
+
+    # Called with the lock held
+
+    def _block_of(self, key):
+        return max(bisect.bisect_right(self._firsts, key) - 1, 0)
+
+    def _insert(self, key):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._firsts.append(key)
+            self._tops.append(key)
+            return
+        b = self._block_of(key)
+        block = self._blocks[b]
+        bisect.insort(block, key)
+        self._firsts[b] = block[0]
+        if self._score[key] > self._score[self._tops[b]]:
+            self._tops[b] = key
+        if len(block) >= 2 * BLOCK_SIZE:
+            upper = block[BLOCK_SIZE:]
+            del block[BLOCK_SIZE:]
+            self._blocks.insert(b + 1, upper)
+            self._firsts.insert(b + 1, upper[0])
+            self._tops[b] = max(block, key=self._score.__getitem__)
+            self._tops.insert(b + 1, max(upper, key=self._score.__getitem__))
+
+    def _promote(self, key, score):
+        # key's score grew: fix the cached prefixes it may now win
+        best = self._best
+        for n in range(1, len(key)):
+            prefix = key[:n]
+            current = best.get(prefix, _MISSING)
+            if current is _MISSING:
+                continue
+            if current == "" or (current != key and score > self._score[current]):
+                best[prefix] = key
+
+    def complete(self, prefix):
+        """Return the best candidate starting with prefix and longer than it, or None."""
+        key = prefix.lower()
+        if not key:
+            return None
+        with self._lock:
+            best = self._best.get(key)
+            if best is None:
+                best = self._rank(key)
+                if len(self._best) >= CACHE_MAX:
+                    self._best.clear()
+                self._best[key] = best
+            return self._text[best] if best else None
+
+    def _rank(self, key):
+        # The best completion of the prefix one character shorter is also the
+        # best for this one whenever it still matches
+        shorter = self._best.get(key[:-1])
+        if shorter and len(shorter) > len(key) and shorter.startswith(key):
+            return shorter
+        if not self._blocks:
+            return ""
+        blocks = self._blocks
+        score = self._score.__getitem__
+        end = key + "\U0010ffff"
+        first = self._block_of(key)
+        last = self._block_of(end)
+        start = bisect.bisect_left(blocks[first], key)
+        if start < len(blocks[first]) and blocks[first][start] == key:
+            start += 1  # the prefix itself is not a completion
+        stop = bisect.bisect_right(blocks[last], end)
+        if first == last:
+            return max(islice(blocks[first], start, stop), key=score, default="")
+        candidates = [
+            max(islice(blocks[first], start, None), key=score, default=""),
+            max(islice(blocks[last], 0, stop), key=score, default=""),
+        ]
+        if last > first + 1:
+            candidates.append(max(islice(self._tops, first + 1, last), key=score))
+        candidates = [c for c in candidates if c]
+        return max(candidates, key=score, default="")
+
+
+class HistoryCompleter:
+    """
+    Inline completion for a history store (HistoryManager or
+    SQLiteHistoryManager) and a set of aliases. The index is built from
+    the history on a background thread and then follows it through
+    subscribe(): each search is one use() of the entry and of its
+    "alias:". Changes that are not a single search (clearing, trimming,
+    another process writing) mark the index stale; completions keep using
+    it while a new one is built.
+    """
+
+    def __init__(self, history, aliases=()):
+        self.history = history
+        self.index = None
+        self._stale = True
+        self._builder = None
+        self._aliases = frozenset(aliases)
+        history.subscribe(self._on_history)
+
+    def _alias_of(self, entry):
+        alias, sep, _query = entry.partition(":")
+        if sep and alias in self._aliases:
+            return alias + ":"
+        return None
+
+    def _on_history(self, entry):
+        if entry is None:
+            self._stale = True
+        elif self.index is not None and not self._stale:
+            alias = self._alias_of(entry)
+            if alias:
+                self.index.use(entry, alias)
+            else:
+                self.index.use(entry)
+
+    def set_aliases(self, aliases):
+        aliases = frozenset(aliases)
+        if aliases == self._aliases:
+            return
+        removed = self._aliases - aliases
+        self._aliases = aliases
+        if self.index is not None:
+            for alias in removed:
+                self.index.remove(alias + ":")
+            for alias in aliases:
+                self.index.add(alias + ":")
+
+    def prepare(self):
+        """Build the index now if it is missing or stale."""
+        if self.index is not None and not self._stale:
+            return
+        # Reading the history delivers its pending changes first, so they do
+        # not mark the new index stale again
+        len(self.history)
+        self._stale = False
+        if hasattr(self.history, "iter_uses"):
+            uses = self.history.iter_uses()
+        else:
+            uses = ((entry, 1) for entry in self.history.read_history())
+        with trace.span("completion.build") as span:
+            index = FrecencyIndex()
+            index.load(uses, related=self._alias_of)
+            for alias in self._aliases:
+                index.add(alias + ":")
+            span.set(candidates=len(index))
+        self.index = index
+
+    def refresh(self):
+        """Build the index on a background thread if it is missing or stale."""
+        if self.index is not None and not self._stale:
+            return
+        if self._builder is not None and self._builder.is_alive():
+            return
+        self._builder = threading.Thread(target=self.prepare, name="pywebsearch-completion", daemon=True)
+        self._builder.start()
+
+    def complete(self, text):
+        """
+        Return the best completion of text (a candidate starting with it,
+        case aside), or None. Never waits for the index to be built.
+        """
+        self.refresh()
+        index = self.index
+        if index is None or not text.strip():
+            return None
+        return index.complete(text)
+
+    def close(self):
+        self.history.unsubscribe(self._on_history)
@@ -0,0 +1,327 @@
+import os
+import gettext
+from collections import namedtuple
+from types import MappingProxyType
+
+from pywebsearch.core import trace
+
+_ = gettext.gettext
+
+
+# Keys that are settings rather than aliases
+CONFIG_KEYS = frozenset({
+    "default_alias", "default_browser", "cmd_prefix", "extra_browsers", "alt_browser", "alt_cmd_prefix",
+    "launch_coalesce_ms", "history_max", "history_backend",
+})
+
+# Named alias sets: set.<name>="g+so+gh"
+SET_PREFIX = "set."
+
+
+def _parse_alias(rest):
+    cmd_part = rest.split("#")[0].strip().strip('"')
+    desc_part = ""
+    if "#" in rest:
+        desc_part = rest.split("#", 1)[1].strip()
+    return {"cmd": cmd_part, "desc": desc_part}
+
+
+def _parse_set(rest):
+    keys = []
+    for key in _parse_alias(rest)["cmd"].split("+"):
+        key = key.strip()
+        if key and key not in keys:
+            keys.append(key)
+    return tuple(keys)
+
+
+class ConfigSnapshot(
+    namedtuple("ConfigSnapshot", ["version", "values", "aliases", "extra_browsers", "sets"])
+):
+    """
+    Immutable view of one parsed version of the config file.
+
+    ConfigHandler hands out the same snapshot until the file is reloaded or
+    written, then bumps `version`. Consumers remember the version they last
+    applied instead of comparing or re-reading settings.
+    """
+
+    __slots__ = ()
+
+    def get(self, key):
+        return self.values.get(key, "")
+
+    @property
+    def default_alias(self):
+        return self.get("default_alias")
+
+    @property
+    def default_browser(self):
+        return self.get("default_browser")
+
+    @property
+    def alt_browser(self):
+        return self.get("alt_browser")
+
+    @property
+    def cmd_prefix(self):
+        return self.get("cmd_prefix") or ">"
+
+    @property
+    def alt_cmd_prefix(self):
+        return self.get("alt_cmd_prefix") or "@"
+
+    @property
+    def launch_coalesce_ms(self):
+        try:
+            return max(0, int(self.get("launch_coalesce_ms") or 0))
+        except ValueError:
+            return 0
+
+    @property
+    def history_max(self):
+        """
+        Maximum number of history entries; 0 means unlimited. Configs from
+        before the setting existed have no limit, so upgrading never
+        trims an existing history (new configs are written with 10000).
+        """
+        try:
+            return max(0, int(self.get("history_max") or 0))
+        except ValueError:
+            return 0
+
+    @property
+    def history_backend(self):
+        """Either "sqlite" or "text" (the default); read once at startup."""
+        return "sqlite" if (self.get("history_backend") or "").strip().lower() == "sqlite" else "text"
+
+
+class ConfigHandler:
+    """
+    Line-preserving config reader/writer.
+
+    The raw lines are kept as read, so comments, blank lines and ordering
+    survive a round trip. Alongside them, load() builds in a single pass an
+    index of the first `key=` line for each key and the parsed aliases, so
+    lookups don't rescan the file and set_value() only replaces one line.
+    """
+
+    def __init__(self, config_file):
+        self.config_file = config_file
+        self.lines = []
+        self._index = {}
+        self._aliases = {}
+        self._sets = {}
+        self._snapshot = None
+        self._stamp = None
+        self._listeners = []
+        self.version = 0
+        self.load()
+
+    def load(self):
+        with trace.span("config.load") as span:
+            if not os.path.exists(self.config_file):
+                self.lines = []
+                self._stamp = None
+            else:
+                with open(self.config_file, "r", encoding="utf-8") as f:
+                    # Stat before reading: a write racing with us then shows up
+                    # as a change on the next check instead of being missed
+                    self._stamp = self._signature(os.fstat(f.fileno()))
+                    self.lines = f.readlines()
+            self._reindex()
+            span.set(lines=len(self.lines))
+
+    @staticmethod
+    def _signature(st):
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def stat_signature(self):
+        """Return (inode, size, mtime_ns) of the config file, or None if missing."""
+        try:
+            return self._signature(os.stat(self.config_file))
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        """
+        Reload if the file was replaced or modified since it was last read or
+        written by this handler. Costs a single stat when nothing changed.
+        Returns True if the config was reloaded.
+        """
+        if self.stat_signature() == self._stamp:
+            return False
+        self.load()
+        return True
+
+    def _reindex(self):
+        index = {}
+        aliases = {}
+        sets = {}
+        for i, line in enumerate(self.lines):
+            # get_value() matches the first line starting with exactly "key="
+            raw_key, sep, _rest = line.partition("=")
+            if not sep:
+                continue
+            if raw_key not in index:
+                index[raw_key] = i
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            key, rest = stripped.split("=", 1)
+            key = key.strip()
+            # Omit config keys and malformed alias names
+            if key in CONFIG_KEYS:
+                continue
+            if key.startswith(SET_PREFIX):
+                sets[key[len(SET_PREFIX):]] = _parse_set(rest)
+                continue
+            aliases[key] = _parse_alias(rest)
+        self._index = index
+        self._aliases = aliases
+        self._sets = sets
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._snapshot = None
+        if self._listeners:
+            snapshot = self.snapshot()
+            for callback in list(self._listeners):
+                callback(snapshot)
+
+    def subscribe(self, callback):
+        """Call callback(snapshot) after every reload or write."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def snapshot(self):
+        """Return the ConfigSnapshot for the current contents."""
+        if self._snapshot is None:
+            values = {key: self.get_value(key) for key in CONFIG_KEYS}
+            extra = tuple(v.strip() for v in values["extra_browsers"].split(",") if v.strip())
+            aliases = {key: MappingProxyType(dict(data)) for key, data in self._aliases.items()}
+            self._snapshot = ConfigSnapshot(
+                self.version,
+                MappingProxyType(values),
+                MappingProxyType(aliases),
+                extra,
+                MappingProxyType(dict(self._sets)),
+            )
+        return self._snapshot
+
+    def save(self):
+        with open(self.config_file, "w", encoding="utf-8") as f:
+            f.writelines(self.lines)
+            f.flush()
+            # Our own writes must not look like an external edit
+            self._stamp = self._signature(os.fstat(f.fileno()))
+
+    def get_value(self, key):
+        i = self._index.get(key)
+        if i is None:
+            return ""
+        return self.lines[i].split("=", 1)[1].strip().strip('"')
+
+    def set_value(self, key, value):
+        line = f'{key}="{value}"\n'
+        i = self._index.get(key)
+        if i is not None:
+            self.lines[i] = line
+        else:
+            self._append_line(line)
+            self._index[key] = len(self.lines) - 1
+        if key.strip() not in CONFIG_KEYS:
+            # Rare (settings are config keys); rebuild so duplicates resolve as on load
+            self._reindex()
+        else:
+            self._changed()
+        self.save()
+
+    def get_sets(self):
+        """Return {name: (alias keys...)} for the set.<name> lines."""
+        return dict(self._sets)
+
+    def add_alias(self, key, cmd, desc):
+        line = f'{key}="{cmd}" # {desc}\n'
+        self._append_line(line)
+        self._index.setdefault(key, len(self.lines) - 1)
+        self._aliases[key] = _parse_alias(line.split("=", 1)[1])
+        self._changed()
+        self.save()
+
+    def _append_line(self, line):
+        # A last line without newline would otherwise be merged with this one
+        if self.lines and not self.lines[-1].endswith("\n"):
+            self.lines[-1] += "\n"
+        self.lines.append(line)
+
+    def get_aliases(self):
+        # Copy so callers can't modify the parsed index
+        return dict(self._aliases)
+
+    def get_extra_browsers(self):
+        return list(self.snapshot().extra_browsers)
+    # Already have set_value -- store as comma-separated string.
+
+    def create_default_config(self):
+        """
+        Create a default configuration file with config keys at the top,
+        aliases clearly separated, and 'extra_browsers' present.
+        """
+        if os.path.exists(self.config_file):
+            return
+        with open(self.config_file, "w", encoding="utf-8") as f:
+            f.write(
+                _(
+                    """# 🧠 Default alias (if left empty, DuckDuckGo via !bangs will be used)
+default_alias=""
+
+# 🌐 Default and alt browser (firefox, chromium, brave, google-chrome...)
+# Leave empty to use system default
+default_browser=""
+alt_browser=""
+
+# 🚀 Prefix to open URLs directly (e.g., >github.com)
+# You can change to ~, @, ^, ::, >, etc.
+cmd_prefix=">"
+alt_cmd_prefix="@"
+
+# 🧭 Extra imported browsers (comma-separated)
+extra_browsers=""
+
+# ⏱️ Open URLs launched within this many milliseconds with a single browser
+# command (e.g. 50). 0 launches every URL on its own.
+launch_coalesce_ms="0"
+
+# 🕘 Searches kept in the history; re-running one moves it to the end (0 = unlimited)
+history_max="10000"
+
+# 🗄️ History storage: "text" (pywebsearch_history) or "sqlite" (indexed search
+# for very large histories; the text history is imported on first use)
+history_backend="text"
+
+# 🔎 Custom aliases in alias=URL-or-command format #comment
+g="https://www.google.com/search?q=$query" #Google
+i="https://www.google.com/search?tbm=isch&q=$query" #Google Images
+y="https://www.youtube.com/results?search_query=$query" #YouTube
+w="https://en.wikipedia.org/wiki/Special:Search?search=$query" #Wikipedia (EN)
+p="https://www.perplexity.ai/search?q=$query" #Perplexity.ai
+d="https://www.wordreference.com/definition/$query" #English dictionary
+trans="https://translate.google.com/?sl=auto&tl=es&text=$query" #Google Translate
+gh="https://github.com/search?q=$query&type=repositories" #GitHub
+gl="https://gitlab.com/search?search=+$query" #GitLab
+so="https://stackoverflow.com/search?q=$query" #Stack Overflow
+r="https://www.reddit.com/search?q=$query" #Reddit
+
+#Example of external browser with flags (URL between ' '):
+.y="chromium --incognito 'https://www.youtube.com/results?search_query=$query'" #YouTube (incognito)
+
+# 🧩 Alias sets: dev:query searches all of them at once (same as g+so+gh:query)
+set.dev="g+so+gh"
+"""
+                )
+            )
@@ -0,0 +1,153 @@
+"""
+Fuzzy matching for the selection dialogs, in the style of fzf.
+
+A query matches a candidate when its characters appear in it in order
+(a subsequence), case and spaces in the query aside. A regex built from
+the query finds the candidates that match, in C; only those are scored.
+The score rewards each matched character, consecutive runs and matches
+at the start of a word, and charges each gap, so "ghp" ranks "gh:python"
+above "github hypothesis". As in fzf's first algorithm, the span scored
+is the forward match shortened from its end: the reversed query is
+matched backwards from where the forward match ended.
+
+FuzzyMatcher keeps what scoring needs for each candidate (its lowercase
+and reversed text), computed once when the candidate is added, and
+narrows incrementally: when every match of the new query must also have
+matched the previous one (e.g. a character was typed), only the previous
+matches and candidates added since are tried again.
+"""
+
+import re
+from itertools import compress, repeat
+from operator import gt
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+BONUS_BOUNDARY = 8
+BONUS_CONSECUTIVE = 4
+# The first query character counts its boundary bonus this many times
+BONUS_FIRST_MULTIPLIER = 2
+
+# Characters after which a match starts a word
+SEPARATORS = frozenset(" \t:/\\-_.,;|!?#&=+()[]{}<>@'\"")
+
+
+def _chain(chars):
+    # c1[^c2]*c2[^c3]*c3...: each character at its first occurrence after
+    # the previous one, without the backtracking of .*?
+    parts = ["(" + re.escape(chars[0]) + ")"]
+    for char in chars[1:]:
+        escaped = re.escape(char)
+        parts.append("[^" + escaped + "]*(" + escaped + ")")
+    return "".join(parts)
+
+
+class FuzzyQuery:
+    def __init__(self, text):
+        self.chars = "".join(text.lower().split())
+        if not self.chars:
+            return
+        self.forward = re.compile(_chain(self.chars), re.DOTALL)
+        self.backward = re.compile(_chain(self.chars[::-1]), re.DOTALL)
+        # The query as a substring starting a word
+        separators = "".join(re.escape(char) for char in sorted(SEPARATORS))
+        self.word = re.compile("(?:^|[" + separators + "])" + re.escape(self.chars))
+        # Score of the query found as one consecutive run, bar the first bonus
+        self.run_score = (
+            SCORE_MATCH * len(self.chars)
+            + BONUS_CONSECUTIVE * (len(self.chars) - 1)
+            + BONUS_BOUNDARY * sum(1 for char in self.chars[:-1] if char in SEPARATORS)
+        )
+
+    def __bool__(self):
+        return bool(self.chars)
+
+    def narrows(self, previous):
+        """True if every match of this query also matches `previous`."""
+        return bool(previous) and previous.forward.search(self.chars) is not None
+
+    def score(self, key, rkey, m):
+        """Score key (lowercase; rkey reversed) given the forward match m."""
+        start = key.find(self.chars)
+        if start >= 0:
+            # A consecutive run is the tightest span there is; prefer one
+            # that starts a word
+            if start == 0 or key[start - 1] in SEPARATORS or self.word.search(key, start):
+                return self.run_score + BONUS_BOUNDARY * BONUS_FIRST_MULTIPLIER
+            return self.run_score
+        size = len(key)
+        count = len(self.chars)
+        r = self.backward.match(rkey, size - m.end())
+        score = 0
+        previous = -2
+        for i in range(count):
+            position = size - 1 - r.start(count - i)
+            score += SCORE_MATCH
+            if position == 0 or key[position - 1] in SEPARATORS:
+                score += BONUS_BOUNDARY * (BONUS_FIRST_MULTIPLIER if i == 0 else 1)
+            if position == previous + 1:
+                score += BONUS_CONSECUTIVE
+            elif i:
+                score += SCORE_GAP_START + SCORE_GAP_EXTENSION * (position - previous - 2)
+            previous = position
+        return score
+
+
+class FuzzyMatcher:
+    def __init__(self, items=()):
+        self._keys = []       # lowercase text of each candidate
+        self._rkeys = []      # the same, reversed
+        self._query = None    # last query matched
+        self._matches = []    # indexes that matched it, in order
+        self._checked = 0     # candidates there were then
+        self.extend(items)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def extend(self, items):
+        """Add candidates; their indexes continue from the existing ones."""
+        for item in items:
+            key = item.lower()
+            self._keys.append(key)
+            self._rkeys.append(key[::-1])
+
+    def match(self, text):
+        """
+        Return the indexes of the candidates matching text, best first;
+        equal scores keep the candidates' order. An empty query matches
+        nothing.
+        """
+        query = FuzzyQuery(text)
+        if not query:
+            self._query = None
+            return []
+        keys = self._keys
+        if len(query.chars) == 1:
+            # One character is one run wherever it is: list the candidates
+            # starting with it first, using string methods alone
+            char = query.chars
+            indexes = range(len(keys))
+            found = list(map(str.__contains__, keys, repeat(char)))
+            first = list(map(str.startswith, keys, repeat(char)))
+            self._query = query
+            self._matches = list(compress(indexes, found))
+            self._checked = len(keys)
+            return list(compress(indexes, first)) + list(compress(indexes, map(gt, found, first)))
+        if query.narrows(self._query):
+            candidates = self._matches + list(range(self._checked, len(keys)))
+            found = list(map(query.forward.search, map(keys.__getitem__, candidates)))
+        else:
+            candidates = range(len(keys))
+            found = list(map(query.forward.search, keys))
+        # The regex runs in C over every candidate; only its matches are scored
+        matches = list(compress(candidates, found))
+        self._query = query
+        self._matches = matches
+        self._checked = len(keys)
+        rkeys = self._rkeys
+        score = query.score
+        scores = [-score(keys[i], rkeys[i], m) for i, m in zip(matches, filter(None, found))]
+        order = sorted(range(len(matches)), key=scores.__getitem__)
+        return [matches[j] for j in order]
@@ -0,0 +1,369 @@
+import os
+import stat
+import tempfile
+import threading
+from itertools import islice
+
+from pywebsearch.core import trace
+
+# Bytes before the indexed offset compared to tell appends from rewrites
+TAIL_BYTES = 256
+# Compact once dead lines outnumber live entries by this factor...
+COMPACT_RATIO = 1.0
+# ...and there are at least this many of them
+COMPACT_MIN_DEAD = 200
+
+
+class HistoryManager:
+    """
+    Search history stored one entry per line in an append-only file.
+
+    The file is a log: running a query again appends it again, and the
+    latest line of an entry is the one that counts, so the history is
+    ordered by last use. In memory the log is kept as a list in which
+    superseded lines are tombstoned (None), plus an entry -> position
+    index, which keeps adding an entry O(1). With max_entries set, the
+    oldest entries beyond it are tombstoned too.
+
+    Before each use the file is stat'ed: if it grew (another instance or
+    the daemon appended to it) and still ends with the bytes indexed last,
+    only the new bytes are read; if it was replaced, truncated or rewritten
+    the index is rebuilt from scratch. Once dead lines outnumber live ones,
+    a background thread rewrites the file with just the live entries and
+    atomically replaces it, which keeps its size and load time bounded.
+
+    Readers never need a full copy: iter_recent() and recent() walk the
+    log from the newest entry, cursor() steps through it for Up/Down
+    navigation, and subscribe() reports each change as it happens.
+    """
+
+    def __init__(self, history_file, max_entries=0):
+        self.history_file = history_file
+        self.max_entries = max_entries  # 0 keeps everything
+        if not os.path.exists(self.history_file):
+            with open(self.history_file, "a", encoding="utf-8"):
+                pass
+        self._lock = threading.Lock()
+        self._compactor = None
+        self._generation = 0
+        self._listeners = []
+        self._events = []
+        self._reset()
+
+    def _reset(self):
+        self._entries = []        # every line of the file, None once superseded
+        self._positions = {}      # entry -> index of its live line
+        self._live = 0            # number of live entries
+        self._head = 0            # no live entry before this index
+        self._offset = 0          # bytes of the file already indexed
+        self._tail = b""          # the last TAIL_BYTES of them
+        self._stamp = None        # (inode, size, mtime_ns) when last synced
+        self._unterminated = False  # last indexed line has no newline yet
+        self._generation += 1
+
+    def _sync(self):
+        # Called with the lock held
+        try:
+            st = os.stat(self.history_file)
+        except FileNotFoundError:
+            if self._stamp is not None:
+                self._reset()
+                self._emit(None)
+            return
+        if self._stamp == (st.st_ino, st.st_size, st.st_mtime_ns):
+            return
+        if self._stamp is None or self._stamp[0] != st.st_ino or st.st_size < self._offset:
+            self._reset()
+        with open(self.history_file, "rb") as f:
+            st = os.fstat(f.fileno())
+            start = self._offset
+            if start:
+                # Appends leave everything up to our offset untouched; if the
+                # bytes before it differ, the file was rewritten in place.
+                f.seek(start - len(self._tail))
+                if f.read(len(self._tail)) != self._tail:
+                    self._reset()
+                    start = 0
+                    f.seek(0)
+            with trace.span("history.load", offset=start) as span:
+                data = f.read()
+                self._index(data)
+                span.set(entries=self._live)
+        if data:
+            self._emit(None)
+        self._offset = start + len(data)
+        self._tail = (self._tail + data)[-TAIL_BYTES:]
+        self._stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        self._maybe_compact()
+
+    def _index(self, data):
+        if not data:
+            return
+        lines = data.decode("utf-8", errors="replace").split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        self._unterminated = not data.endswith(b"\n")
+        entries = self._entries
+        positions = self._positions
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            old = positions.get(line)
+            if old is None:
+                self._live += 1
+            else:
+                entries[old] = None
+            positions[line] = len(entries)
+            entries.append(line)
+        self._trim()
+
+    def _trim(self):
+        # Tombstone the oldest entries beyond max_entries
+        entries = self._entries
+        while self.max_entries and self._live > self.max_entries:
+            while entries[self._head] is None:
+                self._head += 1
+            del self._positions[entries[self._head]]
+            entries[self._head] = None
+            self._live -= 1
+
+    def _maybe_compact(self):
+        # Called with the lock held
+        dead = len(self._entries) - self._live
+        if dead < COMPACT_MIN_DEAD or dead <= self._live * COMPACT_RATIO:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        # Not a daemon thread: a one-shot CLI run finishes the rewrite before exiting
+        self._compactor = threading.Thread(target=self.compact, name="pywebsearch-history-compact")
+        self._compactor.start()
+
+    def compact(self):
+        """
+        Rewrite the file with only the live entries, in order, and replace
+        it atomically. Lines appended meanwhile (by us or other processes)
+        are carried over; if the file was replaced or cleared meanwhile it
+        is left alone.
+        """
+        with self._lock:
+            self._sync()
+            generation = self._generation
+            offset = self._offset
+            data = "".join(entry + "\n" for entry in self._entries[self._head:] if entry is not None)
+        directory = os.path.dirname(os.path.abspath(self.history_file))
+        fd, tmp_path = tempfile.mkstemp(prefix=".pywebsearch_history.", dir=directory)
+        out = os.fdopen(fd, "wb")
+        try:
+            out.write(data.encode("utf-8"))
+            with self._lock:
+                self._sync()
+                if self._generation != generation:
+                    out.close()
+                    os.unlink(tmp_path)
+                    return False
+                # Another process appending right between this read and the
+                # replace below would lose that line; the window is tiny.
+                with open(self.history_file, "rb") as f:
+                    mode = stat.S_IMODE(os.fstat(f.fileno()).st_mode)
+                    f.seek(offset)
+                    out.write(f.read(self._offset - offset))
+                out.flush()
+                os.fsync(out.fileno())
+                # Windows cannot rename a file that is still open
+                out.close()
+                os.chmod(tmp_path, mode)
+                os.replace(tmp_path, self.history_file)
+                self._reset()
+                self._sync()
+        except OSError as e:
+            out.close()
+            print(f"[HistoryManager] Could not compact {self.history_file}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def set_max_entries(self, max_entries):
+        with self._lock:
+            self.max_entries = max(0, max_entries)
+            if self._stamp is not None and self.max_entries and self._live > self.max_entries:
+                self._trim()
+                self._emit(None)
+                self._maybe_compact()
+        self._deliver()
+
+    # Change notification
+
+    def subscribe(self, callback):
+        """
+        Call callback(entry) after this manager added or moved `entry`, and
+        callback(None) when the history changed otherwise (loaded, cleared,
+        trimmed or appended to by another process). Callbacks run on the
+        thread that made the change, e.g. the launch worker.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, entry):
+        # Called with the lock held; _deliver() runs the callbacks after release
+        if self._listeners:
+            self._events.append(entry)
+
+    def _deliver(self):
+        if not self._events:
+            return
+        with self._lock:
+            events, self._events = self._events, []
+        for entry in events:
+            for callback in list(self._listeners):
+                callback(entry)
+
+    # Reading
+
+    def __len__(self):
+        with self._lock:
+            self._sync()
+            count = self._live
+        self._deliver()
+        return count
+
+    def iter_recent(self):
+        """
+        Yield the live entries, most recent first. The walk works on the log
+        as it was when iteration started, so it needs no lock and no copy.
+        """
+        with self._lock:
+            self._sync()
+            entries = self._entries
+            end = len(entries)
+            head = self._head
+        self._deliver()
+        for i in range(end - 1, head - 1, -1):
+            entry = entries[i]
+            if entry is not None:
+                yield entry
+
+    def recent(self, start=0, stop=None):
+        """Return the live entries ranked start..stop-1 by recency (0 = newest)."""
+        return list(islice(self.iter_recent(), start, stop))
+
+    def read_history(self):
+        """Return the live entries, least recently used first."""
+        with self._lock:
+            self._sync()
+            history = [entry for entry in self._entries[self._head:] if entry is not None]
+        self._deliver()
+        return history
+
+    def cursor(self):
+        """Return a HistoryCursor for stepping through the entries."""
+        return HistoryCursor(self)
+
+    def _step(self, cursor, older):
+        with self._lock:
+            self._sync()
+            entries = self._entries
+            pos = cursor.position
+            if pos is not None and cursor.generation != self._generation:
+                # The log was rebuilt (compaction, clear, reload): find the entry again
+                pos = self._positions.get(cursor.entry)
+            if older:
+                i = (len(entries) if pos is None else pos) - 1
+                while i >= self._head and entries[i] is None:
+                    i -= 1
+                if i < self._head:
+                    i = pos
+            elif pos is None:
+                i = None
+            else:
+                i = pos + 1
+                while i < len(entries) and entries[i] is None:
+                    i += 1
+                if i >= len(entries):
+                    i = None
+            cursor.position = i
+            cursor.generation = self._generation
+            cursor.entry = None if i is None else entries[i]
+        self._deliver()
+        return cursor.entry
+
+    def add_entry(self, entry, alias="", browser=""):
+        # alias and browser are only recorded by the SQLite store
+        entry = entry.strip()
+        if not entry:
+            return
+        with self._lock:
+            self._sync()
+            if self._positions.get(entry) == len(self._entries) - 1:
+                return  # Already the most recent entry
+            data = ("\n" if self._unterminated else "") + entry + "\n"
+            data = data.encode("utf-8")
+            with open(self.history_file, "ab") as f:
+                f.write(data)
+                f.flush()
+                st = os.fstat(f.fileno())
+            if self._stamp is not None and st.st_ino == self._stamp[0] and st.st_size == self._offset + len(data):
+                # Nobody else wrote in between: index our line directly
+                self._index(data)
+                self._offset = st.st_size
+                self._tail = (self._tail + data)[-TAIL_BYTES:]
+                self._stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+                self._emit(entry)
+                self._maybe_compact()
+            else:
+                self._sync()
+        self._deliver()
+
+    def clear_history(self):
+        with self._lock:
+            with open(self.history_file, "w", encoding="utf-8") as f:
+                f.truncate()
+            self._reset()
+            self._emit(None)
+        self._deliver()
+
+
+class HistoryCursor:
+    """
+    Position in a HistoryManager for Up/Down navigation. older() and
+    newer() return the entry moved to; newer() past the most recent entry
+    returns None and starts over, and older() at the oldest entry stays
+    there. The cursor follows the live history, so entries added while
+    navigating are reachable without reloading anything.
+    """
+
+    def __init__(self, history):
+        self.history = history
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.generation = None
+        self.entry = None
+
+    def older(self):
+        return self.history._step(self, older=True)
+
+    def newer(self):
+        return self.history._step(self, older=False)
+
+
+def open_history(history_file, backend="text", max_entries=0):
+    """
+    Return the history store for the configured backend: HistoryManager for
+    "text", SQLiteHistoryManager (core/history_db.py) for "sqlite". If the
+    database cannot be opened the text file is used instead.
+    """
+    if backend == "sqlite":
+        try:
+            from pywebsearch.core.history_db import SQLiteHistoryManager
+            return SQLiteHistoryManager(history_file, max_entries=max_entries)
+        except Exception as e:
+            print(f"[HistoryManager] SQLite history unavailable ({e}), using {history_file}")
+    return HistoryManager(history_file, max_entries=max_entries)
@@ -0,0 +1,399 @@
+"""
+SQLite history store (history_backend="sqlite").
+
+Same interface as HistoryManager, backed by a database next to the text
+history file. Each query is one row holding the time it was last used,
+the alias and browser of that use and how many times it was run. Running
+a query again re-inserts its row, so row ids are in order of last use and
+"most recent first" is a walk down the primary key that stops as soon as
+enough rows were found.
+
+Filtering goes through an FTS5 index: with the trigram tokenizer (SQLite
+3.34+) `LIKE '%text%'` on the index finds any substring, including terms
+shorter than three characters; older SQLite falls back to word prefixes,
+and a build without FTS5 to a plain LIKE scan. The database runs in WAL
+mode, so the GUI, the daemon and one-shot command line runs can use it at
+the same time.
+
+On first use the entries of the text history file are imported in order.
+The text file is left in place: backups export the database to it and
+restores import it back (export_text/import_text).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from pywebsearch.core import trace
+from pywebsearch.core.history import HistoryCursor
+
+DB_SUFFIX = ".sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL UNIQUE,
+    ts REAL NOT NULL,
+    alias TEXT NOT NULL DEFAULT '',
+    browser TEXT NOT NULL DEFAULT '',
+    uses INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# trigram only needs to know which rows hold a trigram, not where
+FTS_OPTIONS = {
+    "trigram": "tokenize='trigram', detail=none",
+    "unicode61": "tokenize='unicode61'",
+}
+
+FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    query, content='history', content_rowid='id', {options}
+)
+"""
+
+# Run one by one inside the creating transaction (executescript would commit)
+FTS_TRIGGERS = (
+    """
+CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts(rowid, query) VALUES (new.id, new.query);
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+    INSERT INTO history_fts(history_fts, rowid, query) VALUES ('delete', old.id, old.query);
+END
+""",
+)
+
+INSERT = "INSERT INTO history (query, ts, alias, browser, uses) VALUES (?, ?, ?, ?, ?)"
+
+
+def _fts_tokenizer(conn):
+    """Return the best FTS5 tokenizer available, or "" without FTS5."""
+    for tokenizer, options in FTS_OPTIONS.items():
+        try:
+            conn.execute(f"CREATE VIRTUAL TABLE temp.fts_probe USING fts5(x, {options})")
+        except sqlite3.OperationalError:
+            continue
+        conn.execute("DROP TABLE temp.fts_probe")
+        return tokenizer
+    return ""
+
+
+def _like_pattern(text):
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class SQLiteHistoryManager:
+    def __init__(self, history_file, max_entries=0, db_path=None):
+        self.history_file = history_file
+        self.db_path = db_path or history_file + DB_SUFFIX
+        self.max_entries = max_entries  # 0 keeps everything
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._events = []
+        with trace.span("history.load", backend="sqlite") as span:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.executescript(SCHEMA)
+            self.tokenizer = self._meta("tokenizer")
+            if self.tokenizer is None:
+                self._create(span)
+            self._data_version = self._pragma_data_version()
+            span.set(entries=self._count())
+
+    def _create(self, span):
+        # New database: import the text history, then index it in one go,
+        # which is much faster than indexing row by row through the triggers
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Another process (the GUI, the daemon) may have created it while
+            # this one waited for the lock
+            self.tokenizer = self._meta("tokenizer")
+            if self.tokenizer is not None:
+                return
+            self.tokenizer = _fts_tokenizer(self._conn)
+            self._bulk_insert(self._read_text(self.history_file))
+            if self.tokenizer:
+                self._conn.execute(FTS_TABLE.format(options=FTS_OPTIONS[self.tokenizer]))
+                self._conn.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+                for trigger in FTS_TRIGGERS:
+                    self._conn.execute(trigger)
+            self._set_meta("tokenizer", self.tokenizer)
+            self._set_meta("migrated", str(int(time.time())))
+        span.set(migrated=True)
+
+    def _meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _pragma_data_version(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def _check_external(self):
+        # Called with the lock held: PRAGMA data_version changes when another
+        # connection (another instance, the daemon) committed a write
+        version = self._pragma_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._emit(None)
+
+    def _use(self, entry, ts, alias="", browser="", uses=1):
+        # Called inside a transaction: (re)insert entry as the most recent row
+        row = self._conn.execute("SELECT id, uses FROM history WHERE query = ?", (entry,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM history WHERE id = ?", (row[0],))
+            uses += row[1]
+        self._conn.execute(INSERT, (entry, ts, alias, browser, uses))
+
+    def _bulk_insert(self, lines):
+        # Called inside a transaction on an empty table: one row per distinct
+        # line, ordered by its last occurrence, with the number of occurrences
+        counts = {}
+        for line in lines:
+            counts[line] = counts.pop(line, 0) + 1
+        items = list(counts.items())
+        if self.max_entries:
+            items = items[-self.max_entries:]
+        ts = time.time()
+        self._conn.executemany(INSERT, ((line, ts, "", "", uses) for line, uses in items))
+
+    def _trim(self):
+        if not self.max_entries:
+            return 0
+        row = self._conn.execute(
+            "SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?", (self.max_entries,)
+        ).fetchone()
+        if row is None:
+            return 0
+        return self._conn.execute("DELETE FROM history WHERE id <= ?", (row[0],)).rowcount
+
+    @staticmethod
+    def _read_text(path):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return [line.strip() for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    # Change notification (see HistoryManager.subscribe)
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, entry):
+        if self._listeners:
+            self._events.append(entry)
+
+    def _deliver(self):
+        if not self._events:
+            return
+        with self._lock:
+            events, self._events = self._events, []
+        for entry in events:
+            for callback in list(self._listeners):
+                callback(entry)
+
+    # Writing
+
+    def add_entry(self, entry, alias="", browser=""):
+        entry = entry.strip()
+        if not entry:
+            return
+        with self._lock:
+            self._check_external()
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._use(entry, time.time(), alias or "", browser or "")
+                self._trim()
+            self._emit(entry)
+        self._deliver()
+
+    def clear_history(self):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute("DELETE FROM history")
+            self._emit(None)
+        self._deliver()
+
+    def set_max_entries(self, max_entries):
+        with self._lock:
+            self.max_entries = max(0, max_entries)
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                trimmed = self._trim()
+            if trimmed:
+                self._emit(None)
+        self._deliver()
+
+    def import_text(self, path, replace=False):
+        """
+        Add the entries of a text history file, oldest first, as if they
+        had been run in that order. With replace=True the store is emptied
+        first (restoring a backup).
+        """
+        lines = self._read_text(path)
+        ts = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                if replace:
+                    self._conn.execute("DELETE FROM history")
+                for line in lines:
+                    self._use(line, ts)
+                self._trim()
+            self._emit(None)
+        self._deliver()
+
+    def export_text(self, path):
+        """Write the entries to a text history file, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT query FROM history ORDER BY id").fetchall()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(row[0] + "\n" for row in rows)
+        os.replace(tmp_path, path)
+
+    # Reading
+
+    def __len__(self):
+        with self._lock:
+            self._check_external()
+            count = self._count()
+        self._deliver()
+        return count
+
+    def read_history(self):
+        """Return the entries, least recently used first."""
+        with self._lock:
+            self._check_external()
+            rows = self._conn.execute("SELECT query FROM history ORDER BY id").fetchall()
+        self._deliver()
+        return [row[0] for row in rows]
+
+    def recent(self, start=0, stop=None):
+        """Return the entries ranked start..stop-1 by recency (0 = newest)."""
+        limit = -1 if stop is None else max(0, stop - start)
+        with self._lock:
+            self._check_external()
+            rows = self._conn.execute(
+                "SELECT query FROM history ORDER BY id DESC LIMIT ? OFFSET ?", (limit, start)
+            ).fetchall()
+        self._deliver()
+        return [row[0] for row in rows]
+
+    def iter_recent(self, page=500):
+        """Yield the entries, most recent first, fetching them a page at a time."""
+        last_id = None
+        while True:
+            with self._lock:
+                if last_id is None:
+                    self._check_external()
+                    rows = self._conn.execute(
+                        "SELECT id, query FROM history ORDER BY id DESC LIMIT ?", (page,)
+                    ).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        "SELECT id, query FROM history WHERE id < ? ORDER BY id DESC LIMIT ?", (last_id, page)
+                    ).fetchall()
+            self._deliver()
+            for last_id, query in rows:
+                yield query
+            if len(rows) < page:
+                return
+
+    def iter_uses(self, page=500):
+        """Yield (entry, uses), least recently used first, a page at a time."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, query, uses FROM history WHERE id > ? ORDER BY id LIMIT ?", (last_id, page)
+                ).fetchall()
+            for last_id, query, uses in rows:
+                yield query, uses
+            if len(rows) < page:
+                return
+
+    def search(self, text, limit=200):
+        """Return up to `limit` entries containing `text`, most recent first."""
+        text = text.strip()
+        if not text:
+            return self.recent(0, limit)
+        if self.tokenizer == "trigram":
+            matches = "SELECT rowid FROM history_fts WHERE query LIKE ? ESCAPE '\\'"
+            params = (_like_pattern(text), limit)
+        elif self.tokenizer == "unicode61" and text.replace(" ", "").isalnum():
+            matches = "SELECT rowid FROM history_fts WHERE history_fts MATCH ?"
+            params = (" ".join('"' + word + '"*' for word in text.split()), limit)
+        else:
+            matches = "SELECT id FROM history WHERE query LIKE ? ESCAPE '\\'"
+            params = (_like_pattern(text), limit)
+        # Newest matches first: walks the ids downwards and stops at `limit`
+        sql = (
+            f"SELECT query FROM history WHERE id IN ({matches} ORDER BY 1 DESC LIMIT ?) "
+            "ORDER BY id DESC"
+        )
+        with self._lock:
+            self._check_external()
+            rows = self._conn.execute(sql, params).fetchall()
+        self._deliver()
+        return [row[0] for row in rows]
+
+    def details(self, entry):
+        """Return (ts, alias, browser, uses) recorded for entry, or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT ts, alias, browser, uses FROM history WHERE query = ?", (entry,)
+            ).fetchone()
+
+    def cursor(self):
+        """Return a HistoryCursor for stepping through the entries."""
+        return HistoryCursor(self)
+
+    def _step(self, cursor, older):
+        # cursor.position is the row id of the entry shown
+        with self._lock:
+            self._check_external()
+            if older:
+                if cursor.position is None:
+                    row = self._conn.execute(
+                        "SELECT id, query FROM history ORDER BY id DESC LIMIT 1"
+                    ).fetchone()
+                else:
+                    row = self._conn.execute(
+                        "SELECT id, query FROM history WHERE id < ? ORDER BY id DESC LIMIT 1",
+                        (cursor.position,),
+                    ).fetchone()
+                if row is None and cursor.position is not None:
+                    row = (cursor.position, cursor.entry)
+            elif cursor.position is None:
+                row = None
+            else:
+                row = self._conn.execute(
+                    "SELECT id, query FROM history WHERE id > ? ORDER BY id LIMIT 1", (cursor.position,)
+                ).fetchone()
+            cursor.position, cursor.entry = row if row is not None else (None, None)
+        self._deliver()
+        return cursor.entry
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,487 @@
+import fnmatch
+import json
+import os
+import shlex
+import tempfile
+import threading
+import time
+
+from pywebsearch.core import trace
+from pywebsearch.core.supervisor import get_supervisor
+
+# Executable name patterns recognised as browsers when found in PATH
+BROWSER_PATTERNS = (
+    "firefox*",
+    "chromium*",
+    "google-chrome*",
+    "brave*",
+    "opera*",
+    "vivaldi*",
+    "microsoft-edge*",
+)
+TEXT_BROWSERS = ("lynx", "w3m", "links")
+BROWSER_CACHE_FILE = "browsers.json"
+
+# Guards the lazy creation of each helper's URL buffer
+_PENDING_INIT_LOCK = threading.Lock()
+
+
+class BrowserRegistry:
+    """
+    Cached view of the executables in PATH.
+
+    Each PATH directory is listed once with os.scandir and the listing is
+    kept together with the directory's mtime. Lookups re-stat the
+    directories at most every `revalidate` seconds and list a directory
+    again only if its mtime changed; a different PATH value invalidates
+    everything. On Windows names are matched case-insensitively and
+    PATHEXT extensions are tried like the shell does.
+    """
+
+    def __init__(self, patterns=BROWSER_PATTERNS, names=TEXT_BROWSERS, revalidate=2.0):
+        self.patterns = patterns
+        self.names = names
+        self.revalidate = revalidate
+        self.windows = os.name == "nt"
+        self._path = None
+        self._dirs = ()
+        self._listings = {}      # directory -> (mtime_ns, frozenset of names)
+        self._executable = {}    # full path -> bool, reset when its directory changes
+        self._checked_at = None
+        self._detected = None
+
+    def _norm(self, name):
+        return name.lower() if self.windows else name
+
+    def _refresh(self):
+        path = os.environ.get("PATH", "")
+        now = time.monotonic()
+        if path == self._path and now - self._checked_at < self.revalidate:
+            return
+        if path != self._path:
+            self._path = path
+            dirs = []
+            for entry in path.split(os.pathsep):
+                if entry and entry not in dirs:
+                    dirs.append(entry)
+            self._dirs = tuple(dirs)
+            self._detected = None
+        self._checked_at = now
+        start = time.perf_counter()
+
+        listings = {}
+        for directory in self._dirs:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._listings.get(directory)
+            if cached is None or cached[0] != mtime:
+                try:
+                    with os.scandir(directory) as it:
+                        names = frozenset(self._norm(entry.name) for entry in it)
+                except OSError:
+                    continue
+                cached = (mtime, names)
+                self._detected = None
+                prefix = os.path.join(directory, "")
+                for full in [p for p in self._executable if p.startswith(prefix)]:
+                    del self._executable[full]
+            listings[directory] = cached
+        if listings.keys() != self._listings.keys():
+            self._detected = None
+        self._listings = listings
+        trace.record("browser.scan", start, dirs=len(listings))
+
+    def _is_executable(self, full):
+        result = self._executable.get(full)
+        if result is None:
+            result = os.access(full, os.X_OK) and not os.path.isdir(full)
+            self._executable[full] = result
+        return result
+
+    def _candidates(self, name):
+        if not self.windows:
+            return (name,)
+        name = name.lower()
+        exts = [e.lower() for e in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(os.pathsep) if e]
+        if any(name.endswith(ext) for ext in exts):
+            return (name,)
+        return tuple(name + ext for ext in exts) + (name,)
+
+    def which(self, name):
+        """Return the full path of executable `name` in PATH, or None."""
+        if not name or os.sep in name or (os.altsep and os.altsep in name):
+            return None
+        self._refresh()
+        candidates = self._candidates(name)
+        for directory in self._dirs:
+            listing = self._listings.get(directory)
+            if listing is None:
+                continue
+            for candidate in candidates:
+                if candidate in listing[1]:
+                    full = os.path.join(directory, candidate)
+                    if self._is_executable(full):
+                        return full
+        return None
+
+    def detect(self):
+        """Return the frozenset of browser executable names found in PATH."""
+        self._refresh()
+        if self._detected is None:
+            start = time.perf_counter()
+            detected = set()
+            for directory in self._dirs:
+                listing = self._listings.get(directory)
+                if listing is None:
+                    continue
+                for name in listing[1]:
+                    if name.startswith("."):
+                        continue
+                    if any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns):
+                        if self._is_executable(os.path.join(directory, name)):
+                            detected.add(name)
+            for name in self.names:
+                if self.which(name):
+                    detected.add(name)
+            self._detected = frozenset(detected)
+            trace.record("browser.detect", start, source="PATH", found=len(detected))
+        return self._detected
+
+
+def scan_installed_browsers():
+    """
+    Enumerate installed browsers with the optional 'browsers' package.
+    Returns a dict mapping lowercase browser names to executable paths.
+    """
+    try:
+        import browsers
+    except ImportError:
+        return {}
+    found = {}
+    for b in browsers.browsers():
+        name = b.get("browser_type") or b.get("display_name") or b.get("name")
+        path = b.get("path") or b.get("location")
+        if name and path and os.path.isfile(path):
+            found[name.lower()] = path
+    return found
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class BrowserMapCache:
+    """
+    Browser map (name -> executable path) persisted as JSON in the data dir.
+
+    load() returns the saved map at once, keeping only entries whose
+    executable still has the size and mtime recorded when it was detected.
+    refresh_async() runs the slow detection in a daemon thread, then swaps
+    the new map in, writes it back atomically and calls on_update(map).
+    `detect` is any callable returning such a map (scan_installed_browsers
+    by default), so the logic can be exercised without real browsers.
+    """
+
+    def __init__(self, path, detect=scan_installed_browsers):
+        self.path = path
+        self.detect = detect
+        self.browsers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._refreshed = False
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("browsers", {})
+        except (OSError, ValueError, AttributeError):
+            entries = {}
+        browsers = {}
+        for name, entry in entries.items():
+            try:
+                path, stamp = entry["path"], entry["stamp"]
+            except (TypeError, KeyError):
+                continue
+            if _file_stamp(path) == stamp:
+                browsers[name] = path
+        self.browsers = browsers
+        return browsers
+
+    def save(self, browsers):
+        data = {
+            "browsers": {
+                name: {"path": path, "stamp": _file_stamp(path)}
+                for name, path in browsers.items()
+            }
+        }
+        # A temporary file of its own: the GUI and the daemon may both be saving
+        fd, tmp_path = tempfile.mkstemp(prefix=".browsers.", dir=os.path.dirname(self.path) or ".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def refresh(self):
+        """Detect now, store and return the new map."""
+        with self._lock:
+            with trace.span("browser.detect", source="cache refresh") as span:
+                browsers = dict(self.detect())
+                span.set(found=len(browsers))
+            self.browsers = browsers
+            self._refreshed = True
+            try:
+                self.save(browsers)
+            except OSError:
+                pass
+        return browsers
+
+    def refresh_async(self, on_update=None):
+        def run():
+            try:
+                browsers = self.refresh()
+            except Exception as e:
+                print(f"[BrowserMapCache] Browser detection failed: {e}")
+                return
+            if on_update is not None:
+                on_update(browsers)
+
+        self._thread = threading.Thread(target=run, name="pywebsearch-browsers", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def refreshing(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def current(self):
+        """
+        Return an up to date map: waits for a running background refresh,
+        or detects now if none has run in this process.
+        """
+        if self._thread is not None:
+            self._thread.join()
+        if not self._refreshed:
+            return self.refresh()
+        return self.browsers
+
+
+class PlatformHelper:
+    # Browser settings mirrored from the attached ConfigHandler
+    config = None
+    default_browser = ""
+    alt_browser = ""
+    extra_browsers = ()
+    # Milliseconds to buffer URLs in submit_url(); 0 launches immediately
+    coalesce_ms = 0
+    _pending_lock = None
+    _pending_urls = None
+    _browser_registry = None
+    _browser_cache = None
+
+    @property
+    def browser_registry(self):
+        """BrowserRegistry for PATH lookups, created on first use."""
+        if self._browser_registry is None:
+            self._browser_registry = BrowserRegistry()
+        return self._browser_registry
+
+    @property
+    def supervisor(self):
+        """The process-wide LaunchSupervisor that spawns and reaps children."""
+        return get_supervisor()
+
+    @property
+    def browser_cache(self):
+        """BrowserMapCache stored in the data directory, created on first use."""
+        if self._browser_cache is None:
+            _config_dir, data_dir = self.get_platform_dirs()
+            self._browser_cache = BrowserMapCache(os.path.join(data_dir, BROWSER_CACHE_FILE))
+        return self._browser_cache
+
+    def attach_config(self, config):
+        """
+        Follow an in-memory ConfigHandler: browser settings are updated from
+        its change notifications instead of reading the file on each launch.
+        """
+        if self.config is not None and self.config is not config:
+            self.config.unsubscribe(self.apply_config)
+        self.config = config
+        config.subscribe(self.apply_config)
+        self.apply_config(config.snapshot())
+
+    def apply_config(self, snapshot):
+        self.default_browser = snapshot.default_browser
+        self.alt_browser = snapshot.alt_browser
+        self.extra_browsers = snapshot.extra_browsers
+        self.coalesce_ms = snapshot.launch_coalesce_ms
+
+    def get_platform_dirs(self):
+        raise NotImplementedError
+
+    def open_config_file(self, path, verbose=False):
+        raise NotImplementedError
+
+    def detect_available_browsers(self):
+        raise NotImplementedError
+
+    def is_browser_available(self, browser_name):
+        raise NotImplementedError
+
+    def read_default_browser_from_config(self):
+        if self.config is not None:
+            return self.default_browser
+        config_dir, _ = self.get_platform_dirs()
+        conf_path = os.path.join(config_dir, "pywebsearch.conf")
+
+        if not os.path.exists(conf_path):
+            return ""
+
+        with open(conf_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("default_browser="):
+                    return line.split("=", 1)[1].strip().strip('"')
+        return ""
+
+    def launch_browser(self, cmd_list, verbose=False):
+        raise NotImplementedError
+
+    def launch_url(self, url, browser=None, verbose=False):
+        """Open url with `browser`, or the configured default browser."""
+        browser_str = browser or self.read_default_browser_from_config()
+        if browser_str:
+            parts = shlex.split(browser_str)
+            exec_path_or_name = parts[0]
+            args = parts[1:]
+            cmd_list = [exec_path_or_name] + args + [url]
+            if not self.launch_browser(cmd_list, verbose):
+                if verbose:
+                    print(
+                        f"[{self.__class__.__name__}] Could not launch configured browser, falling back."
+                    )
+                self.launch_default_system_url(url, verbose)
+        else:
+            if verbose:
+                print(
+                    f"[{self.__class__.__name__}] No default_browser configured, using system fallback."
+                )
+            self.launch_default_system_url(url, verbose)
+
+    def launch_urls(self, urls, browser=None, verbose=False):
+        """
+        Open several URLs. Helpers override this to pass them to a single
+        browser invocation; the default opens them one by one.
+        """
+        for url in urls:
+            if browser:
+                self.launch_url(url, browser=browser, verbose=verbose)
+            else:
+                self.launch_url(url, verbose=verbose)
+
+    def _pending_buffer(self):
+        # Created once per helper; two first submits racing must share it
+        if self._pending_lock is None:
+            with _PENDING_INIT_LOCK:
+                if self._pending_lock is None:
+                    self._pending_urls = {}
+                    self._pending_lock = threading.Lock()
+        return self._pending_lock, self._pending_urls
+
+    def submit_url(self, url, browser=None, verbose=False, fallback=None):
+        """
+        Launch url, coalescing bursts: with coalesce_ms set, URLs for the
+        same browser arriving within that window are opened together by one
+        launch_urls() call instead of one process each. If that launch
+        fails, fallback(url, browser) is called for each URL, when given.
+        """
+        if self.coalesce_ms <= 0:
+            if browser:
+                return self.launch_url(url, browser=browser, verbose=verbose)
+            return self.launch_url(url, verbose=verbose)
+        lock, buffered = self._pending_buffer()
+        key = browser or ""
+        with lock:
+            pending = buffered.get(key)
+            if pending is None:
+                timer = threading.Timer(self.coalesce_ms / 1000, self._flush_browser, args=(key, verbose))
+                pending = buffered[key] = ([], timer, fallback)
+                timer.start()
+            pending[0].append(url)
+
+    def _flush_browser(self, key, verbose=False):
+        lock, buffered = self._pending_buffer()
+        with lock:
+            pending = buffered.pop(key, None)
+        if pending is None:
+            return
+        urls, timer, fallback = pending
+        timer.cancel()
+        browser = key or None
+        try:
+            if len(urls) == 1:
+                if browser:
+                    self.launch_url(urls[0], browser=browser, verbose=verbose)
+                else:
+                    self.launch_url(urls[0], verbose=verbose)
+            else:
+                self.launch_urls(urls, browser=browser, verbose=verbose)
+        except Exception as e:
+            if fallback is None:
+                print(f"[{self.__class__.__name__}] Could not launch {len(urls)} URL(s): {e}")
+                return
+            for url in urls:
+                try:
+                    fallback(url, browser)
+                except Exception as e:
+                    print(f"[{self.__class__.__name__}] Could not launch {url}: {e}")
+
+    def flush_urls(self):
+        """Launch every buffered URL now (e.g. before exiting)."""
+        if not self._pending_urls:
+            return
+        with self._pending_lock:
+            keys = list(self._pending_urls)
+        for key in keys:
+            self._flush_browser(key)
+
+    def launch_default_system_url(self, url, verbose=False):
+        raise NotImplementedError
+
+    def refresh_browsers(self):
+        """
+        Refresh the detected browsers in the background, for front ends that
+        stay running (GUI, daemon). Base implementation does nothing.
+        """
+        return None
+
+    def init_tray_icon(self, main_window):
+        """
+        Initialize the system tray icon for the platform.
+        Base implementation does nothing.
+        """
+        return None
+
+    def check_single_instance(self):
+        """
+        Check if an instance is already running.
+        Base implementation returns False (no single instance).
+        """
+        return False
+
+    def send_activation_message(self):
+        """
+        Send a message to the existing instance to activate window.
+        Base implementation no-op.
+        """
+        pass
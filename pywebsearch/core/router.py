@@ -0,0 +1,192 @@
+"""
+Query routing.
+
+QueryRouter is compiled once from the configuration and turns an input string
+into an immutable ResolvedAction in a single pass. Alias templates are
+compiled into literal and placeholder segments when the router is built (see
+templates.py), so expanding a query is a plain join. Launching the action is
+a separate step (PyWebSearchApp.launch_action), which lets dry-run and batch
+tools share this code path without spawning anything.
+"""
+
+import re
+import time
+from collections import namedtuple
+from urllib.parse import quote_plus
+
+from pywebsearch.core import trace
+from pywebsearch.core.templates import TemplateError, compile_template
+
+DUCKDUCKGO_URL = "https://duckduckgo.com/?q="
+
+ResolvedAction = namedtuple(
+    "ResolvedAction",
+    [
+        "kind",            # "url", "command" or "group"
+        "target",          # URL, or the command line for commands
+        "argv",            # tuple of command arguments, None for URLs and shell commands
+        "browser",         # browser command to use, "" for the default
+        "add_history",     # whether the input belongs in the history
+        "alias",           # alias key used, "" when none
+        "fallback_query",  # query to search on DuckDuckGo if launching fails
+        "children",        # for "group" actions, the ResolvedAction of each alias
+    ],
+    defaults=(None,),
+)
+
+
+class QueryRouter:
+    def __init__(
+        self,
+        aliases,
+        default_alias="",
+        cmd_prefix=">",
+        alt_cmd_prefix="@",
+        default_browser="",
+        alt_browser="",
+        bangs=None,
+        sets=None,
+    ):
+        # Aliases whose template does not compile are left out and reported
+        # in self.errors (key -> message) instead of failing at search time.
+        self.templates = {}
+        self.errors = {}
+        for key, data in aliases.items():
+            try:
+                self.templates[key] = compile_template(data["cmd"])
+            except TemplateError as e:
+                self.errors[key] = str(e)
+        # Named alias sets (name -> alias keys); unknown members are reported
+        self.sets = {}
+        for name, keys in (sets or {}).items():
+            known = tuple(key for key in keys if key in self.templates)
+            unknown = [key for key in keys if key not in self.templates]
+            if unknown:
+                self.errors[f"set.{name}"] = f"Unknown aliases in set: {', '.join(unknown)}"
+            if known:
+                self.sets[name] = known
+        self.default_alias = default_alias
+        self.cmd_prefix = cmd_prefix
+        self.alt_cmd_prefix = alt_cmd_prefix
+        self.default_browser = default_browser or ""
+        self.alt_browser = alt_browser or ""
+        # Optional BangIndex resolving known !bangs without the DuckDuckGo hop
+        self.bangs = bangs
+
+    @classmethod
+    def from_config(cls, config, bangs=None):
+        snapshot = config.snapshot()
+        return cls(
+            snapshot.aliases,
+            default_alias=snapshot.default_alias,
+            cmd_prefix=snapshot.cmd_prefix,
+            alt_cmd_prefix=snapshot.alt_cmd_prefix,
+            default_browser=snapshot.default_browser,
+            alt_browser=snapshot.alt_browser,
+            bangs=bangs,
+            sets=snapshot.sets,
+        )
+
+    def duckduckgo(self, query, browser, add_history=True):
+        if self.bangs is not None and "!" in query:
+            url = self.bangs.resolve(query)
+            if url:
+                return ResolvedAction("url", url, None, browser, add_history, "", None)
+        return ResolvedAction(
+            "url", DUCKDUCKGO_URL + quote_plus(query), None, browser, add_history, "", None
+        )
+
+    def expand_alias(self, key, query, browser="", url_browser=""):
+        """Resolve `key:query`; unknown keys fall back to DuckDuckGo."""
+        template = self.templates.get(key)
+        if template is None:
+            return self.duckduckgo(query, self.default_browser)
+        start = trace.enabled and time.perf_counter()
+        target, argv = template.expand(query)
+        if start:
+            trace.record("template.expand", start, alias=key)
+        if target.startswith(("http://", "https://")):
+            return ResolvedAction("url", target, None, url_browser, True, key, None)
+        if template.needs_shell:
+            argv = None
+        return ResolvedAction("command", target, argv, browser, True, key, query)
+
+    def group_keys(self, key):
+        """
+        Return the alias keys of a fan-out key (a set name or g+so+gh with
+        only known aliases), or None.
+        """
+        keys = self.sets.get(key)
+        if keys is not None:
+            return keys
+        if "+" not in key:
+            return None
+        keys = []
+        for part in key.split("+"):
+            part = part.strip()
+            if part not in self.templates:
+                return None
+            if part not in keys:
+                keys.append(part)
+        return tuple(keys)
+
+    def expand_group(self, name, keys, query, browser="", url_browser=""):
+        """Resolve one query against several aliases as a single "group" action."""
+        children = tuple(
+            self.expand_alias(key, query, browser=browser, url_browser=url_browser) for key in keys
+        )
+        return ResolvedAction("group", query, None, url_browser, True, name, None, children)
+
+    def _expand_key(self, key, query, browser="", url_browser=""):
+        if key in self.templates:
+            return self.expand_alias(key, query, browser=browser, url_browser=url_browser)
+        keys = self.group_keys(key)
+        if keys:
+            return self.expand_group(key, keys, query, browser=browser, url_browser=url_browser)
+        return None
+
+    def resolve(self, input_str):
+        """Return the ResolvedAction for an input string, or None if it is empty."""
+        start = trace.enabled and time.perf_counter()
+        action = self._resolve(input_str)
+        if start:
+            trace.record("query.parse", start, kind=action and action.kind)
+        return action
+
+    def _resolve(self, input_str):
+        input_str = input_str.strip()
+        if not input_str:
+            return None
+
+        cmd_prefix = self.cmd_prefix
+        alt_prefix = self.alt_cmd_prefix
+        if alt_prefix and input_str.startswith(alt_prefix):
+            actual_query = input_str[len(alt_prefix):].strip()
+            if cmd_prefix and actual_query.startswith(cmd_prefix):
+                url = actual_query[len(cmd_prefix):].strip()
+                return ResolvedAction("url", url, None, self.alt_browser, False, "", None)
+            if ":" in actual_query:
+                key, query = actual_query.split(":", 1)
+                action = self._expand_key(
+                    key.strip(), query.strip(), browser=self.alt_browser, url_browser=self.alt_browser
+                )
+                if action is not None:
+                    return action
+            return self.duckduckgo(actual_query, self.alt_browser)
+
+        if cmd_prefix and input_str.startswith(cmd_prefix):
+            url = input_str[len(cmd_prefix):]
+            if not re.match(r"^[a-zA-Z]+://", url):
+                url = f"https://{url}"
+            return ResolvedAction("url", url, None, self.default_browser, True, "", None)
+
+        if ":" in input_str:
+            key, query = input_str.split(":", 1)
+            action = self._expand_key(key.strip(), query.strip())
+            if action is not None:
+                return action
+            return self.duckduckgo(input_str, self.default_browser)
+
+        if self.default_alias:
+            return self.expand_alias(self.default_alias, input_str)
+        return self.duckduckgo(input_str, self.default_browser)
@@ -0,0 +1,247 @@
+import os
+import re
+import threading
+import webbrowser
+import gettext
+from concurrent.futures import ThreadPoolExecutor
+from pywebsearch.core.router import QueryRouter
+from pywebsearch.core.supervisor import get_supervisor
+
+
+_ = gettext.gettext
+
+
+class PyWebSearchApp:
+    """
+    Core search logic, URL handling, alias execution, and query processing.
+    """
+
+    supported_browsers = {
+        "firefox",
+        "chromium",
+        "brave",
+        "google-chrome",
+        "chrome",
+        "opera",
+        "safari",
+    }
+
+    def __init__(self, platform_module=None, dialogs=None):
+        self.platform = platform_module
+        # GUI dialogs are injected by the caller; headless use leaves them unset
+        self.dialogs = dialogs
+        self.aliases = {}
+        self.default_alias = ""
+        self.default_browser = ""
+        self.alt_browser = ""
+        self.cmd_prefix = ">"
+        self.alt_cmd_prefix = "@"
+        self.sets = {}
+        self.bangs = None
+        self.snapshot = None
+        self.history = None
+        self.router = QueryRouter({})
+        # Passed to the platform helper: print the commands it runs
+        self.verbose = False
+        # Created on first asynchronous search; one worker keeps launches in order
+        self._launcher = None
+
+    def reload_config(self):
+        """Re-read the config file and apply it."""
+        self.config.load()
+        return self.apply_config()
+
+    def apply_config(self, snapshot=None):
+        """
+        Adopt the config handler's current snapshot (or the one given).
+        Returns False without doing anything if that version is already applied.
+        """
+        if snapshot is None:
+            snapshot = self.config.snapshot()
+        if self.snapshot is not None and self.snapshot.version == snapshot.version:
+            return False
+        self.snapshot = snapshot
+        self.aliases = snapshot.aliases
+        self.default_alias = snapshot.default_alias
+        self.default_browser = snapshot.default_browser
+        self.cmd_prefix = snapshot.cmd_prefix
+        self.alt_cmd_prefix = snapshot.alt_cmd_prefix
+        self.alt_browser = snapshot.alt_browser
+        self.sets = snapshot.sets
+        if self.history is not None:
+            self.history.set_max_entries(snapshot.history_max)
+        self.compile_router()
+        return True
+
+    def compile_router(self):
+        """Rebuild the query router from the current settings."""
+        self.router = QueryRouter(
+            self.aliases,
+            default_alias=self.default_alias,
+            cmd_prefix=self.cmd_prefix,
+            alt_cmd_prefix=self.alt_cmd_prefix,
+            default_browser=self.default_browser,
+            alt_browser=self.alt_browser,
+            bangs=self.bangs,
+            sets=self.sets,
+        )
+
+    def launch_url(self, url, browser=None):
+        if self.platform and getattr(self.platform, "coalesce_ms", 0) > 0:
+            # Opt-in: the helper buffers bursts and opens them together,
+            # falling back to webbrowser if that launch fails
+            try:
+                return self.platform.submit_url(
+                    url, browser=browser, verbose=self.verbose, fallback=self._open_webbrowser
+                )
+            except Exception:
+                return self._open_webbrowser(url, browser)
+        if self.platform:
+            try:
+                if browser:
+                    return self.platform.launch_url(url, browser=browser, verbose=self.verbose)
+                else:
+                    return self.platform.launch_url(url, verbose=self.verbose)
+            except Exception:
+                pass
+        return self._open_webbrowser(url, browser)
+
+    def _open_webbrowser(self, url, browser=None):
+        if browser:
+            try:
+                wb = webbrowser.get(browser)
+                return wb.open(url, new=2)
+            except Exception:
+                return webbrowser.open(url, new=2)
+        return webbrowser.open(url, new=2)
+
+    def launch_urls(self, urls, browser=None):
+        """Open several URLs, in a single browser invocation where possible."""
+        if len(urls) == 1:
+            return self.launch_url(urls[0], browser=browser)
+        if self.platform and hasattr(self.platform, "launch_urls"):
+            try:
+                if browser:
+                    return self.platform.launch_urls(urls, browser=browser, verbose=self.verbose)
+                else:
+                    return self.platform.launch_urls(urls, verbose=self.verbose)
+            except Exception:
+                pass
+        for url in urls:
+            self.launch_url(url, browser=browser)
+
+    def open_direct_url(self, url):
+        if not re.match(r"^[a-zA-Z]+://", url):
+            url = f"https://{url}"
+        self.launch_url(url, browser=self.default_browser)
+
+    def duckduckgo_search(self, query):
+        self.launch_action(self.router.duckduckgo(query, self.default_browser))
+
+    def launch_command(self, cmd, browser=None, fallback_query=None, argv=None):
+        """
+        Run an alias command line. The platform helper gets the first chance;
+        otherwise it is spawned directly from argv, or through the shell when
+        the command needs one (argv is None). If spawning fails the query
+        falls back to DuckDuckGo.
+        """
+        if hasattr(self, "platform") and hasattr(self.platform, "launch_alias_command"):
+            try:
+                if browser:
+                    launched = self.platform.launch_alias_command(cmd, browser=browser, verbose=self.verbose)
+                else:
+                    launched = self.platform.launch_alias_command(cmd, verbose=self.verbose)
+                if launched:
+                    return
+            except Exception:
+                pass
+
+        try:
+            if argv:
+                get_supervisor().spawn(list(argv))
+            else:
+                get_supervisor().spawn(cmd, shell=True)
+        except Exception:
+            if fallback_query is not None:
+                self.duckduckgo_search(fallback_query)
+
+    def launch_group(self, action):
+        """
+        Launch a fan-out action: URLs going to the same browser are opened
+        by one invocation, and each browser (and each alias command) is
+        launched concurrently.
+        """
+        by_browser = {}
+        jobs = []
+        for child in action.children:
+            if child.kind == "url":
+                by_browser.setdefault(child.browser or "", []).append(child.target)
+            else:
+                jobs.append((self.launch_action, (child,)))
+        jobs[:0] = [(self.launch_urls, (urls, browser)) for browser, urls in by_browser.items()]
+
+        threads = [
+            threading.Thread(target=func, args=args, name="pywebsearch-group", daemon=True)
+            for func, args in jobs[1:]
+        ]
+        for thread in threads:
+            thread.start()
+        if jobs:
+            func, args = jobs[0]
+            func(*args)
+        for thread in threads:
+            thread.join()
+
+    def launch_action(self, action):
+        """Launch a ResolvedAction produced by the router."""
+        if action.kind == "group":
+            self.launch_group(action)
+        elif action.kind == "url":
+            self.launch_url(action.target, browser=action.browser)
+        else:
+            self.launch_command(
+                action.target,
+                browser=action.browser,
+                fallback_query=action.fallback_query,
+                argv=action.argv,
+            )
+
+    def execute_search(self, key, query):
+        self.launch_action(self.router.expand_alias(key, query))
+
+    def process_search(self, input_str, history_manager=None):
+        action = self.router.resolve(input_str)
+        if action is None:
+            return
+        self._run_action(action, input_str, history_manager)
+
+    def _run_action(self, action, input_str, history_manager):
+        if history_manager is not None and action.add_history:
+            history_manager.add_entry(input_str, alias=action.alias, browser=action.browser)
+        self.launch_action(action)
+        return action
+
+    def process_search_async(self, input_str, history_manager=None):
+        """
+        Resolve input_str now and run its side effects (history write,
+        spawning the browser or command) on a background worker.
+
+        Returns a concurrent.futures.Future whose result is the
+        ResolvedAction (None for empty input) or whose exception is
+        whatever launching raised. Searches run one at a time, in the
+        order they were submitted.
+        """
+        action = self.router.resolve(input_str)
+        if self._launcher is None:
+            self._launcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pywebsearch-launch")
+        if action is None:
+            return self._launcher.submit(lambda: None)
+        return self._launcher.submit(self._run_action, action, input_str, history_manager)
+
+    def shutdown(self, wait=True):
+        """Finish (or with wait=False, abandon) pending asynchronous searches."""
+        if self._launcher is not None:
+            self._launcher.shutdown(wait=wait)
+            self._launcher = None
+        if wait and self.platform and hasattr(self.platform, "flush_urls"):
+            self.platform.flush_urls()
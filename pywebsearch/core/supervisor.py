@@ -0,0 +1,159 @@
+"""
+Supervision of launched browsers and alias commands.
+
+Every process PyWebSearch starts goes through LaunchSupervisor.spawn(), which
+times the spawn and hands the child to a reaper so long-running processes
+(tray, daemon) don't accumulate zombies or Popen objects. On Linux the
+reaper is a single thread waiting on pidfds (os.pidfd_open, Linux 5.3+);
+elsewhere each child gets a small daemon thread blocked in wait().
+Exit statuses and spawn latencies are kept for stats().
+"""
+
+import errno
+import os
+import selectors
+import subprocess
+import threading
+import time
+from collections import deque
+
+from pywebsearch.core import trace
+
+
+class LaunchSupervisor:
+    def __init__(self, history=50):
+        self._lock = threading.Lock()
+        self._live = {}                       # pid -> (Popen, name)
+        self.spawned = 0
+        self.reaped = 0
+        self.failed = 0                       # could not spawn, or exited non-zero
+        self.exit_statuses = deque(maxlen=history)    # (name, pid, returncode)
+        self.spawn_latencies = deque(maxlen=history)  # seconds
+        self._selector = None
+        self._wakeup = None
+        self._pending = []
+        self._reaper = None
+        self._use_pidfd = hasattr(os, "pidfd_open")
+
+    def spawn(self, cmd, shell=False, new_session=True, quiet=True, verbose=False):
+        """
+        Start cmd (an argument list, or a command string with shell=True)
+        detached from our session, and supervise it. Returns the Popen;
+        raises OSError (counted as failed) if it could not be started.
+        """
+        name = os.path.basename((cmd.split() or [""])[0] if shell else cmd[0])
+        kwargs = {"shell": shell, "start_new_session": new_session}
+        if quiet:
+            kwargs["stdout"] = subprocess.DEVNULL
+            kwargs["stderr"] = subprocess.DEVNULL
+        start = time.perf_counter()
+        try:
+            proc = subprocess.Popen(cmd, **kwargs)
+        except OSError:
+            with self._lock:
+                self.failed += 1
+            trace.record("spawn", start, program=name, error="OSError")
+            raise
+        latency = time.perf_counter() - start
+        trace.record("spawn", start, start + latency, program=name, child_pid=proc.pid)
+        with self._lock:
+            self.spawned += 1
+            self.spawn_latencies.append(latency)
+            self._live[proc.pid] = (proc, name)
+        if verbose:
+            print(f"[LaunchSupervisor] Started pid {proc.pid} in {latency * 1000:.2f} ms: {cmd}")
+        self._watch(proc)
+        return proc
+
+    # Reaping
+
+    def _watch(self, proc):
+        if self._use_pidfd:
+            try:
+                fd = os.pidfd_open(proc.pid)
+            except OSError as e:
+                if e.errno == errno.ENOSYS:
+                    # Kernel without pidfd support: use waiter threads from now on
+                    self._use_pidfd = False
+            else:
+                with self._lock:
+                    self._pending.append((fd, proc))
+                    self._ensure_reaper()
+                os.write(self._wakeup[1], b"\0")
+                return
+        threading.Thread(
+            target=self._wait_thread, args=(proc,), name="pywebsearch-reap", daemon=True
+        ).start()
+
+    def _wait_thread(self, proc):
+        proc.wait()
+        self._reaped(proc)
+
+    def _ensure_reaper(self):
+        # Called with the lock held
+        if self._reaper is not None:
+            return
+        self._selector = selectors.DefaultSelector()
+        self._wakeup = os.pipe()
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ, None)
+        self._reaper = threading.Thread(target=self._reap_loop, name="pywebsearch-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            for key, _events in self._selector.select():
+                if key.data is None:
+                    os.read(self._wakeup[0], 512)
+                    with self._lock:
+                        pending, self._pending = self._pending, []
+                    for fd, proc in pending:
+                        self._selector.register(fd, selectors.EVENT_READ, proc)
+                    continue
+                proc = key.data
+                self._selector.unregister(key.fd)
+                os.close(key.fd)
+                proc.wait()
+                self._reaped(proc)
+
+    def _reaped(self, proc):
+        with self._lock:
+            _proc, name = self._live.pop(proc.pid, (proc, "?"))
+            self.reaped += 1
+            if proc.returncode != 0:
+                self.failed += 1
+            self.exit_statuses.append((name, proc.pid, proc.returncode))
+
+    # Reporting
+
+    @property
+    def live(self):
+        with self._lock:
+            return len(self._live)
+
+    def stats(self):
+        """Return a dict of counters and spawn latency figures (ms)."""
+        with self._lock:
+            latencies = list(self.spawn_latencies)
+            return {
+                "spawned": self.spawned,
+                "live": len(self._live),
+                "reaped": self.reaped,
+                "failed": self.failed,
+                "last_spawn_ms": latencies[-1] * 1000 if latencies else None,
+                "mean_spawn_ms": sum(latencies) / len(latencies) * 1000 if latencies else None,
+                "max_spawn_ms": max(latencies) * 1000 if latencies else None,
+                "exit_statuses": list(self.exit_statuses),
+            }
+
+
+_supervisor = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor():
+    """Return the process-wide LaunchSupervisor."""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = LaunchSupervisor()
+        return _supervisor
@@ -0,0 +1,252 @@
+"""
+Alias templates.
+
+Alias commands are compiled once, when the config is loaded, into literal and
+placeholder segments. Expanding a query is then a single join with no regex
+work. Supported placeholders:
+
+    $query              the whole query
+    $1 .. $9, ${12}     the n-th whitespace separated word of the query
+    ${query:ENC}        a placeholder with an explicit encoder
+    $$                  a literal dollar sign in URL templates; in commands
+                        it is left to the shell (its PID)
+
+Encoders: "plus" (default, spaces become +), "path" (spaces become %20, safe
+for path segments) and "raw" (no encoding, URL templates only).
+A bare $n beyond the words of the query is left as written, as is $0.
+
+URL templates are strict: an unknown $NAME (a typo such as $qeury) or a URL
+without any placeholder raises TemplateError at compile time, as do
+mis-typed ${...} placeholders and unknown encoders anywhere. In command
+templates any other $NAME is kept for the shell to expand ($HOME, $USER...).
+
+Command templates are also checked for shell syntax (pipes, redirections,
+globs, variables...). Those without any can be started from their argv
+directly, without a /bin/sh in between.
+"""
+
+import shlex
+from urllib.parse import quote, quote_plus
+
+ENCODERS = {
+    "plus": quote_plus,
+    "path": lambda value: quote(value, safe=""),
+    "raw": lambda value: value,
+}
+DEFAULT_ENCODER = "plus"
+
+# Characters the shell interprets when they appear unquoted in a command
+SHELL_CHARS = frozenset("|&;<>()`\\*?[]{}~$#\n")
+
+
+class TemplateError(ValueError):
+    """Raised for alias templates that cannot be compiled."""
+
+
+def _parse_placeholder(spec, template, written, strict=True, keep=""):
+    # Returns (index, encoder, keep), keep being what a word index beyond
+    # the query expands to; None for an unknown bare $NAME unless strict
+    name, _sep, encoder = spec.partition(":")
+    name = name.strip()
+    encoder = encoder.strip() or DEFAULT_ENCODER
+    if name == "query":
+        index = 0
+    elif name.isdigit() and int(name) > 0:
+        index = int(name)
+    elif not strict:
+        return None
+    else:
+        raise TemplateError(f"Unknown placeholder '{written}' in template: {template}")
+    if encoder not in ENCODERS:
+        raise TemplateError(
+            f"Unknown encoder '{encoder}' in template: {template} "
+            f"(use one of: {', '.join(ENCODERS)})"
+        )
+    return index, encoder, keep
+
+
+def parse_segments(text, template=None, shell=False):
+    """
+    Split text into a tuple of literal strings and (index, encoder, keep)
+    tuples, where index 0 is the whole query and n the n-th word. With
+    shell (a command template), $$ and unknown $NAMEs are kept for the
+    shell; otherwise $$ means '$' and unknown names are errors.
+    """
+    template = template if template is not None else text
+    segments = []
+    literal = []
+    i = 0
+    length = len(text)
+    while True:
+        j = text.find("$", i)
+        if j < 0:
+            literal.append(text[i:])
+            break
+        literal.append(text[i:j])
+        nxt = text[j + 1] if j + 1 < length else ""
+        if nxt == "$":
+            literal.append("$$" if shell else "$")
+            i = j + 2
+            continue
+        if nxt == "{":
+            end = text.find("}", j + 2)
+            if end < 0:
+                raise TemplateError(f"Unterminated '${{' in template: {template}")
+            placeholder = _parse_placeholder(text[j + 2:end], template, text[j:end + 1])
+            i = end + 1
+        elif nxt.isdigit():
+            k = j + 1
+            while k < length and text[k].isdigit():
+                k += 1
+            i = k
+            if int(text[j + 1:k]) == 0:
+                literal.append(text[j:k])
+                continue
+            placeholder = _parse_placeholder(text[j + 1:k], template, text[j:k], keep=text[j:k])
+        elif nxt.isalpha() or nxt == "_":
+            k = j + 1
+            while k < length and (text[k].isalnum() or text[k] == "_"):
+                k += 1
+            placeholder = _parse_placeholder(text[j + 1:k], template, text[j:k], strict=not shell)
+            if placeholder is None:
+                # A shell variable ($HOME, $USER...): keep it for the shell
+                literal.append(text[j:k])
+                i = k
+                continue
+            i = k
+        else:
+            # A lone '$' (end of text, before punctuation...) stays literal
+            literal.append("$")
+            i = j + 1
+            continue
+        text_before = "".join(literal)
+        if text_before:
+            segments.append(text_before)
+        literal = []
+        segments.append(placeholder)
+    tail = "".join(literal)
+    if tail or not segments:
+        segments.append(tail)
+    return tuple(segments)
+
+
+def _needs_shell(segments, argv_segments):
+    """True if the literal parts of a command use shell syntax."""
+    quote = None
+    for segment in segments:
+        if segment.__class__ is not str:
+            continue
+        for ch in segment:
+            if quote == "'":
+                if ch == "'":
+                    quote = None
+            elif quote == '"':
+                if ch == '"':
+                    quote = None
+                elif ch in "$`\\":
+                    return True
+            elif ch in "'\"":
+                quote = ch
+            elif ch in SHELL_CHARS:
+                return True
+    # VAR=value before the command is an environment assignment for sh
+    first = argv_segments[0] if argv_segments else ()
+    return any(s.__class__ is str and "=" in s for s in first)
+
+
+class AliasTemplate:
+    """A compiled alias command: a URL template or a command line template."""
+
+    __slots__ = (
+        "source", "is_url", "segments", "argv_segments", "placeholders", "needs_shell",
+        "_single", "_parts", "_argv_parts",
+    )
+
+    def __init__(self, cmd):
+        self.source = cmd.strip('"')
+        self.is_url = self.source.startswith(("http://", "https://"))
+        self.segments = parse_segments(self.source, shell=not self.is_url)
+        self.placeholders = frozenset(s for s in self.segments if s.__class__ is tuple)
+        self.argv_segments = None
+        self.needs_shell = False
+
+        if self.is_url and not self.placeholders:
+            raise TemplateError(f"Missing placeholder $query in URL template: {self.source}")
+
+        if not self.is_url:
+            if any(encoder == "raw" for _index, encoder, _keep in self.placeholders):
+                raise TemplateError(
+                    f"Unencoded (raw) placeholders are only allowed in URL templates: {self.source}"
+                )
+            try:
+                tokens = shlex.split(self.source)
+            except ValueError as e:
+                raise TemplateError(f"Cannot parse command template ({e}): {self.source}")
+            self.argv_segments = tuple(parse_segments(token, self.source, shell=True) for token in tokens)
+            self.needs_shell = _needs_shell(self.segments, self.argv_segments)
+
+        # Common case (one distinct placeholder, usually $query): keep the
+        # literals around it so expansion is a single str.join.
+        self._single = next(iter(self.placeholders)) if len(self.placeholders) == 1 else None
+        if self._single is not None:
+            self._parts = self._split_literals(self.segments)
+            self._argv_parts = (
+                tuple(self._split_literals(token) for token in self.argv_segments)
+                if self.argv_segments is not None else None
+            )
+
+    @staticmethod
+    def _split_literals(segments):
+        parts = [""]
+        for segment in segments:
+            if segment.__class__ is str:
+                parts[-1] += segment
+            else:
+                parts.append("")
+        return tuple(parts)
+
+    @property
+    def has_placeholders(self):
+        return bool(self.placeholders)
+
+    def _values(self, query):
+        words = None
+        values = {}
+        for placeholder in self.placeholders:
+            index, encoder, keep = placeholder
+            if index == 0:
+                value = query
+            else:
+                if words is None:
+                    words = query.split()
+                if index > len(words):
+                    values[placeholder] = keep
+                    continue
+                value = words[index - 1]
+            values[placeholder] = ENCODERS[encoder](value)
+        return values
+
+    def expand(self, query):
+        """Return (command_or_url, argv) with the query substituted."""
+        single = self._single
+        if single is not None:
+            value = self._values(query)[single] if single[0] else ENCODERS[single[1]](query)
+            target = value.join(self._parts)
+            if self._argv_parts is None:
+                return target, None
+            return target, tuple(value.join(parts) for parts in self._argv_parts)
+
+        values = self._values(query)
+        target = "".join(s if s.__class__ is str else values[s] for s in self.segments)
+        if self.argv_segments is None:
+            return target, None
+        argv = tuple(
+            "".join(s if s.__class__ is str else values[s] for s in token)
+            for token in self.argv_segments
+        )
+        return target, argv
+
+
+def compile_template(cmd):
+    """Compile an alias command, raising TemplateError if it is malformed."""
+    return AliasTemplate(cmd)
@@ -0,0 +1,151 @@
+"""
+Timing spans for the startup and launch paths.
+
+    with trace.span("config.load", lines=n):
+        ...
+
+Tracing is off unless `--profile[=FILE]` is given or the PYWEBSEARCH_PROFILE
+environment variable is set (to a file name, or "-"/"1" for stderr). While
+it is off span() returns a shared do-nothing context manager and record()
+returns at once. Per-query code (the router) checks the module-level
+`enabled` flag before even reading the clock:
+
+    start = trace.enabled and time.perf_counter()
+    ...
+    if start:
+        trace.record("query.parse", start)
+
+When it is on, every finished span is written as one JSON line:
+
+    {"span": "spawn", "ms": 1.84, "at_ms": 93.2, "pid": 4242, "thread": "MainThread", "program": "firefox", "child_pid": 4243}
+
+`at_ms` is the span's start relative to when this module was imported,
+which is close to process start for the command line entry points. Files
+are appended to, so runs from several releases can be collected together.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_VAR = "PYWEBSEARCH_PROFILE"
+
+ORIGIN = time.perf_counter()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "fields", "start")
+
+    def __init__(self, tracer, name, fields):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.fields["error"] = exc_type.__name__
+        self.tracer.emit(self.name, self.start, time.perf_counter() - self.start, self.fields)
+        return False
+
+    def set(self, **fields):
+        """Attach fields only known once the span is running (counts, pids...)."""
+        self.fields.update(fields)
+
+
+class Tracer:
+    def __init__(self, path="-"):
+        self.path = path
+        self._lock = threading.Lock()
+        if path in ("-", "1"):
+            self._out = sys.stderr
+            self._owned = False
+        else:
+            self._out = open(path, "a", encoding="utf-8")
+            self._owned = True
+
+    def emit(self, name, start, seconds, fields):
+        record = {
+            "span": name,
+            "ms": round(seconds * 1000, 3),
+            "at_ms": round((start - ORIGIN) * 1000, 3),
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+        }
+        record.update(fields)
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            if self._out is None:
+                return
+            self._out.write(line)
+            self._out.flush()
+
+    def close(self):
+        with self._lock:
+            if self._owned and self._out is not None:
+                self._out.close()
+            self._out = None
+
+
+_tracer = None
+enabled = False
+
+
+def enable(path="-"):
+    """Start writing spans to path ("-" for stderr). Returns the Tracer."""
+    global _tracer, enabled
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(path)
+    enabled = True
+    return _tracer
+
+
+def disable():
+    global _tracer, enabled
+    enabled = False
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = None
+
+
+def span(name, **fields):
+    """Return a context manager timing `name`; a shared no-op when disabled."""
+    if _tracer is None:
+        return NULL_SPAN
+    return Span(_tracer, name, fields)
+
+
+def record(name, start, end=None, **fields):
+    """Write a span measured by the caller with time.perf_counter() values."""
+    if _tracer is None:
+        return
+    if end is None:
+        end = time.perf_counter()
+    _tracer.emit(name, start, end - start, fields)
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
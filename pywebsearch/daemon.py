@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Resident pywebsearch daemon for Linux.
+
+Keeps the parsed config, alias table and history warm in one long-running
+process and listens on a Unix domain socket. Each connection carries one
+query line; the daemon acknowledges it immediately and resolves and launches
+it on a worker thread, so clients (see pywebsearch.client) return at once.
+"""
+
+import os
+import queue
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+
+from pywebsearch.cli import create_headless_app
+from pywebsearch.client import PROTOCOL_OK, get_socket_path
+from pywebsearch.core.supervisor import get_supervisor
+
+MAX_QUERY_BYTES = 8192
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_QUERY_BYTES + 1)
+        if not line:
+            return  # a liveness probe (see _claim_socket): nothing to answer
+        if not line.endswith(b"\n"):
+            # Too long, or the client went away mid-line: never run a partial query
+            self._reply(b"ERR incomplete or too long query\n")
+            return
+        query = line.decode("utf-8", errors="replace").strip()
+        if not query:
+            self._reply(b"ERR empty query\n")
+            return
+        self.server.daemon.submit(query)
+        self._reply(PROTOCOL_OK + b"\n")
+
+    def _reply(self, message):
+        try:
+            self.wfile.write(message)
+        except OSError:
+            pass  # the client stopped waiting
+
+
+class QueryServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path, daemon):
+        self.daemon = daemon
+        super().__init__(socket_path, QueryHandler)
+
+
+class PyWebSearchDaemon:
+    """Serve queries from a socket using a single warm PyWebSearchApp."""
+
+    def __init__(self, socket_path=None, verbose=False):
+        self.socket_path = socket_path or get_socket_path()
+        self.verbose = verbose
+        self.pyweb_app = create_headless_app()
+        self.pyweb_app.verbose = verbose
+        self.pyweb_app.platform_helper.refresh_browsers()
+        self.queries = queue.Queue()
+        self.server = None
+        self._worker = threading.Thread(
+            target=self._process_queries, name="pywebsearch-worker", daemon=True
+        )
+
+    def _log(self, message):
+        if self.verbose:
+            print(f"[Daemon] {message}", flush=True)
+
+    def _refresh_config(self):
+        # One stat per query; re-parse only when the file actually changed
+        if self.pyweb_app.config.reload_if_changed():
+            self.pyweb_app.apply_config()
+            self._log("Configuration changed, reloaded.")
+
+    def submit(self, query):
+        self.queries.put(query)
+
+    def _process_queries(self):
+        while True:
+            query = self.queries.get()
+            if query is None:
+                return
+            try:
+                self._refresh_config()
+                self._log(f"Query: {query}")
+                self.pyweb_app.process_search(
+                    query, history_manager=self.pyweb_app.history
+                )
+                if self.verbose:
+                    stats = get_supervisor().stats()
+                    self._log(
+                        f"Children: {stats['live']} live, {stats['reaped']} reaped, "
+                        f"{stats['failed']} failed; last spawn {stats['last_spawn_ms'] or 0:.2f} ms"
+                    )
+            except Exception as e:
+                print(f"[Daemon] Error processing '{query}': {e}", file=sys.stderr)
+
+    def _claim_socket(self):
+        try:
+            st = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return
+        # Never remove a file that is not a socket, or someone else's socket
+        if not stat.S_ISSOCK(st.st_mode):
+            raise RuntimeError(f"{self.socket_path} exists and is not a socket")
+        if st.st_uid != os.getuid():
+            raise RuntimeError(f"{self.socket_path} belongs to another user")
+        # A live daemon answers a connection; anything else is a stale socket
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def serve_forever(self):
+        self._claim_socket()
+        old_umask = os.umask(0o177)
+        try:
+            self.server = QueryServer(self.socket_path, self)
+        finally:
+            os.umask(old_umask)
+        self._worker.start()
+        self._log(f"Listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.queries.put(None)
+        if self.server is not None:
+            self.server.server_close()
+            self.server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if args and args[0] in ("--help", "-h"):
+        print("Usage: pywebsearchd [--verbose]\n"
+              "Run the pywebsearch daemon; send queries with pywebsearch-send.")
+        sys.exit(0)
+    if not hasattr(socket, "AF_UNIX") or sys.platform == "win32":
+        print("[Daemon] Unix domain sockets are not available on this platform.", file=sys.stderr)
+        sys.exit(1)
+
+    daemon = PyWebSearchDaemon(verbose="--verbose" in args)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        print(f"[Daemon] {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
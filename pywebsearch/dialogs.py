@@ -1,6 +1,7 @@
 import os
 import gettext
 from PyQt6.QtCore import Qt, QTimer
+from pywebsearch.list_model import FilterListModel
 from PyQt6.QtWidgets import (
     QComboBox,
     QDialog,
@@ -8,8 +9,7 @@ from PyQt6.QtWidgets import (
     QInputDialog,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QPushButton,
     QMessageBox,
     QRadioButton,
@@ -22,8 +22,15 @@ from PyQt6.QtCore import QUrl
 
 _ = gettext.gettext
 
+FILTER_DEBOUNCE_MS = 150
+
 
 class Dialogs:
+    # Exposed so callers outside the GUI layer can pick icons and buttons
+    # without importing PyQt6 themselves.
+    Icon = QMessageBox.Icon
+    StandardButton = QMessageBox.StandardButton
+
     def __init__(self, parent=None):
         self.parent = parent
 
@@ -129,7 +136,9 @@ class Dialogs:
         return None
 
     # Searchable list dialog
-    def show_searchable_list_dialog(self, title, label, items):
+    # items may be any iterable; rows are loaded as the list is scrolled.
+    # search(text, limit) can supply the matches instead (e.g. an index).
+    def show_searchable_list_dialog(self, title, label, items, search=None):
         dialog, layout, btn_box = self._create_base_dialog(title)
         layout.insertWidget(0, QLabel(label))
 
@@ -137,31 +146,28 @@ class Dialogs:
         search_field.setPlaceholderText(_("🔍 Type to filter..."))
         layout.insertWidget(1, search_field)
 
-        list_widget = QListWidget()
-        for item in items:
-            QListWidgetItem(item, list_widget)
-        layout.insertWidget(2, list_widget)
-
-        def filter_items(text):
-            for i in range(list_widget.count()):
-                item = list_widget.item(i)
-                item.setHidden(text.lower() not in item.text().lower())
-
-        search_field.textChanged.connect(filter_items)
+        model = FilterListModel(items, search=search, parent=dialog)
+        model.set_filter("")
+        list_view = QListView()
+        list_view.setModel(model)
+        list_view.setUniformItemSizes(True)
+        layout.insertWidget(2, list_view)
 
-        # Connect double-click signal to accept dialog and close
-        def item_double_clicked(item):
-            # Select the double-clicked item explicitly (usually already selected)
-            list_widget.setCurrentItem(item)
-            dialog.accept()
+        # Filter once typing pauses instead of on every keystroke
+        debounce = QTimer(dialog)
+        debounce.setSingleShot(True)
+        debounce.setInterval(FILTER_DEBOUNCE_MS)
+        debounce.timeout.connect(lambda: model.set_filter(search_field.text()))
+        search_field.textChanged.connect(lambda _text: debounce.start())
 
-        list_widget.itemDoubleClicked.connect(item_double_clicked)
+        # Double-click selects the item and closes the dialog
+        list_view.doubleClicked.connect(lambda _index: dialog.accept())
 
         selected_text = None
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            current_item = list_widget.currentItem()
-            if current_item:
-                selected_text = current_item.text()
+            current = list_view.currentIndex()
+            if current.isValid():
+                selected_text = model.text(current.row())
 
         return selected_text
 
@@ -1,12 +1,9 @@
 #!/usr/bin/env python3
-import glob
 import os
-import shutil
 import shlex
 import subprocess
-from pywebsearch.platform_base import PlatformHelper
+from pywebsearch.core.platform_base import PlatformHelper
 import re
-from PyQt6.QtCore import Qt
 
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -32,46 +29,21 @@ class LinuxHelper(PlatformHelper):
         if verbose:
             subprocess.run(["xdg-open", path])
         else:
-            subprocess.Popen(
-                ["xdg-open", path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                start_new_session=True,
-            )
+            self.supervisor.spawn(["xdg-open", path])
 
     def detect_available_browsers(self):
         """Detect commonly used browser executables in PATH and add any user-defined extra browsers from configuration."""
-        browser_patterns = [
-            "firefox*",
-            "chromium*",
-            "google-chrome*",
-            "brave*",
-            "opera*",
-            "vivaldi*",
-            "microsoft-edge*",
-        ]
-        detected = set()
-        for pattern in browser_patterns:
-            for path_entry in os.environ.get("PATH", "").split(os.pathsep):
-                for match in glob.glob(os.path.join(path_entry, pattern)):
-                    exe = os.path.basename(match)
-                    if os.access(match, os.X_OK):
-                        detected.add(exe)
-        # Detect common text-based browsers
-        for text_browser in ["lynx", "w3m", "links"]:
-            if shutil.which(text_browser):
-                detected.add(text_browser)
+        # PATH listings are cached by the registry and only rescanned on change
+        detected = set(self.browser_registry.detect())
         # Add user-imported browsers from config if available
-        if hasattr(self, "config"):
-            try:
-                detected.update(self.config.get_extra_browsers())
-            except Exception:
-                pass
+        detected.update(self.extra_browsers)
         return detected
 
     def is_browser_available(self, browser_name):
         # If browser_name is detected normally
-        if browser_name in self.detect_available_browsers() and shutil.which(browser_name) is not None:
+        if (
+            browser_name in self.browser_registry.detect() or browser_name in self.extra_browsers
+        ) and self.browser_registry.which(browser_name) is not None:
             return True
         # If user defined it explicitly in an alias, allow (user responsibility)
         if hasattr(self, "aliases") and browser_name in self.aliases:
@@ -89,7 +61,7 @@ class LinuxHelper(PlatformHelper):
         try:
             if verbose:
                 print(f"[Linux] Launching browser command: {' '.join(cmd_list)}")
-            subprocess.Popen(cmd_list)
+            self.supervisor.spawn(cmd_list, verbose=verbose)
             return True
         except Exception as e:
             if verbose:
@@ -108,12 +80,7 @@ class LinuxHelper(PlatformHelper):
         """Fallback launcher using xdg-open for URLs."""
         if verbose:
             print(f"[Linux] Launching default system URL fallback with xdg-open: {url}")
-        subprocess.Popen(
-            ["xdg-open", url],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True,
-        )
+        self.supervisor.spawn(["xdg-open", url], verbose=verbose)
 
     def import_extra_browsers(self):
         """On-demand import and detection of extra browsers via the 'browsers' library.
@@ -139,18 +106,16 @@ class LinuxHelper(PlatformHelper):
             return bool(re.match(pattern, browser_str))
 
         found = set()
-        for browser in browsers.browsers():
-            exe = (
-                browser.get("browser_type")
-                or browser.get("display_name")
-                or browser.get("name")
-            )
+        # Detection results are also stored in the data dir's browser cache
+        for exe in self.browser_cache.current():
             if exe and is_browser_name_safe(exe):
                 if exe not in detected_manual:
                     found.add(exe)
         return found
 
     def handle_key_press_event(self, main_window, event):
+        from PyQt6.QtCore import Qt
+
         if event.key() == Qt.Key.Key_Escape:
             main_window.is_quitting = True
             main_window.close()
@@ -163,41 +128,50 @@ class LinuxHelper(PlatformHelper):
             return True
         return False
 
-    def launch_url(self, url, browser=None, verbose=True):
+    def get_default_browser_command(self):
+        """Configured default browser command, or xdg-open."""
+        return self.default_browser or 'xdg-open'
+
+    def _browser_parts(self, browser, verbose=True):
         if not browser:
-            browser = getattr(self, 'get_default_browser_command', lambda: 'xdg-open')()
+            browser = self.get_default_browser_command()
 
         try:
             parts = shlex.split(browser)
         except Exception:
             parts = ['xdg-open']
+        if not parts:
+            parts = ['xdg-open']
 
         allowed_browsers = {"chromium", "firefox", "brave", "google-chrome", "chrome", "opera", "safari", "io.gitlab.librewolf-community", "librewolf"}
 
         executable = parts[0].lower()
-        flags = parts[1:]
 
         if executable not in allowed_browsers:
             if verbose:
                 print(f"[LinuxHelper] Unsafe browser executable: {executable}, fallback to xdg-open")
             parts = ['xdg-open']
-            flags = []
+        return parts
 
-        cmd = parts + [url]
+    def launch_url(self, url, browser=None, verbose=True):
+        self.launch_urls([url], browser=browser, verbose=verbose)
 
-        try:
-            subprocess.Popen(
-                cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                start_new_session=True,
-            )
-        except Exception as e:
-            if verbose:
-                print(f"[ERROR][LinuxHelper] Error launching URL with browser '{browser}': {e}, fallback to xdg-open")
-            subprocess.Popen(
-                ['xdg-open', url],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                start_new_session=True,
-            )
+    def launch_urls(self, urls, browser=None, verbose=True):
+        """
+        Open URLs with a single browser invocation (`firefox url1 url2`).
+        xdg-open only takes one URL, so it is run once per URL.
+        """
+        parts = self._browser_parts(browser, verbose)
+        if parts == ['xdg-open']:
+            batches = [[url] for url in urls]
+        else:
+            batches = [list(urls)]
+
+        for batch in batches:
+            try:
+                self.supervisor.spawn(parts + batch)
+            except Exception as e:
+                if verbose:
+                    print(f"[ERROR][LinuxHelper] Error launching URL with browser '{browser}': {e}, fallback to xdg-open")
+                for url in batch:
+                    self.supervisor.spawn(['xdg-open', url])
@@ -0,0 +1,217 @@
+"""
+List model for the searchable list dialog.
+
+FilterListModel shows the entries of any iterable (a list, or a generator
+such as HistoryManager.iter_recent) without materialising them up front:
+rows are pulled a page at a time when the view asks for more through
+canFetchMore/fetchMore.
+
+Filtering ranks the entries with core.fuzzy.FuzzyMatcher, best match
+first, whatever their number. Ranking needs every entry: sources of up to
+SYNC_LIMIT entries are ranked right away, larger ones on a worker thread,
+so typing never waits for it. The worker takes over the source, reads the
+rest of it once and ranks each filter text in turn, skipping those already
+replaced by newer text; the rows shown are swapped for its results when
+they arrive. Stores with their own index (SQLiteHistoryManager.search) are
+queried through `search` instead.
+"""
+
+import threading
+from itertools import islice
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+
+from pywebsearch.core.fuzzy import FuzzyMatcher
+
+PAGE_SIZE = 200
+# Sources with more entries than this are ranked on a worker thread
+SYNC_LIMIT = 5000
+
+
+class FilterListModel(QAbstractListModel):
+    # Emitted from the worker thread, delivered on the model's thread
+    _loaded = pyqtSignal(object)       # the rest of the source
+    _ranked = pyqtSignal(int, object)  # generation, indexes best first
+
+    def __init__(self, items, search=None, page_size=PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.search = search
+        self._source = iter(items)
+        self._exhausted = False
+        self._loading = False  # the worker owns the source
+        self._items = []       # every item pulled from the source so far
+        self._matcher = None   # FuzzyMatcher, used by one thread only
+        self._needle = None    # no filter applied yet
+        self._generation = 0   # bumped by each new filter text
+        self._listed = 0       # rows shown while there is no filter
+        self._matches = None   # fuzzy matches, best first, as indexes in _items
+        self._shown = 0        # rows of _matches handed to the view
+        self._searched = None  # rows returned by `search` for the current needle
+        self._search_done = False
+        self._lock = threading.Lock()
+        self._job = None       # (generation, needle) for the worker
+        self._handoff = None   # (source, items) for the worker to load
+        self._worker = None
+        self._loaded.connect(self._on_loaded)
+        self._ranked.connect(self._on_ranked)
+
+    # Source
+
+    def _pull(self, count):
+        if self._exhausted or self._loading:
+            return 0
+        items = list(islice(self._source, count))
+        if len(items) < count:
+            self._exhausted = True
+        self._items.extend(items)
+        return len(items)
+
+    def _short(self):
+        # Read at most SYNC_LIMIT + 1 entries to tell whether the source is short
+        if len(self._items) <= SYNC_LIMIT:
+            self._pull(SYNC_LIMIT + 1 - len(self._items))
+        return self._exhausted and len(self._items) <= SYNC_LIMIT
+
+    # Filtering
+
+    def set_filter(self, text):
+        needle = text.strip().lower()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self._generation += 1
+        if needle and self.search is None and not self._short():
+            self._rank_in_background(needle)
+            return
+        self.beginResetModel()
+        self._searched = None
+        self._matches = None
+        if needle and self.search is not None:
+            self._searched = []
+            self._search_done = False
+        elif needle:
+            if self._matcher is None:
+                self._matcher = FuzzyMatcher(self._items)
+            self._matches = self._matcher.match(needle)
+            self._shown = 0
+        else:
+            self._listed = 0
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def _rank_in_background(self, needle):
+        # The rows shown stay until the worker's results replace them
+        with self._lock:
+            self._job = (self._generation, needle)
+            if not self._loading:
+                self._loading = True
+                self._handoff = (self._source, list(self._items))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="pywebsearch-filter", daemon=True)
+                self._worker.start()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                job, self._job = self._job, None
+                handoff, self._handoff = self._handoff, None
+                if job is None:
+                    self._worker = None
+                    return
+            generation, needle = job
+            try:
+                if handoff is not None:
+                    source, items = handoff
+                    rest = list(source)
+                    self._matcher = FuzzyMatcher(items)
+                    self._matcher.extend(rest)
+                    self._loaded.emit(rest)
+                if generation != self._generation:
+                    continue  # the text changed again meanwhile
+                self._ranked.emit(generation, self._matcher.match(needle))
+            except RuntimeError:
+                # The dialog, and this model with it, was closed
+                with self._lock:
+                    self._worker = None
+                return
+
+    def _on_loaded(self, rest):
+        self._items.extend(rest)
+        self._exhausted = True
+        self._loading = False
+        if self._needle == "" and self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def _on_ranked(self, generation, matches):
+        if generation != self._generation:
+            return
+        self.beginResetModel()
+        self._searched = None
+        self._matches = matches
+        self._shown = 0
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    # QAbstractListModel
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._searched is not None:
+            return len(self._searched)
+        if self._matches is not None:
+            return self._shown
+        return self._listed
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        return self.text(index.row())
+
+    def text(self, row):
+        if self._searched is not None:
+            return self._searched[row]
+        if self._matches is not None:
+            return self._items[self._matches[row]]
+        return self._items[row]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if self._searched is not None:
+            return not self._search_done
+        if self._matches is not None:
+            return self._shown < len(self._matches)
+        return self._listed < len(self._items) or not (self._exhausted or self._loading)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        first = self.rowCount()
+        if self._searched is not None:
+            # Ask the index for one more page and keep what is new
+            rows = self.search(self._needle, limit=len(self._searched) + self.page_size)
+            new_rows = rows[len(self._searched):]
+            self._search_done = len(new_rows) < self.page_size
+            count = len(new_rows)
+        elif self._matches is not None:
+            count = min(self.page_size, len(self._matches) - self._shown)
+        else:
+            # Entries already pulled (e.g. by a filter) are shown first
+            missing = self._listed + self.page_size - len(self._items)
+            if missing > 0:
+                self._pull(missing)
+            count = min(self.page_size, len(self._items) - self._listed)
+        if not count:
+            return
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        if self._searched is not None:
+            self._searched.extend(new_rows)
+        elif self._matches is not None:
+            self._shown += count
+        else:
+            self._listed += count
+        self.endInsertRows()
@@ -7,11 +7,15 @@ import gettext
 
 from platformdirs import user_config_dir
 
-from pywebsearch.search import PyWebSearchApp
+from pywebsearch.core import trace
+from pywebsearch.core.completion import HistoryCompleter
+from pywebsearch.core.search import PyWebSearchApp
 from pywebsearch.app_settings import SettingsManager
+from pywebsearch.config_watcher import ConfigWatcher
+from pywebsearch.dialogs import Dialogs
 
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
 from PyQt6.QtGui import QAction, QShortcut, QKeySequence, QIcon
 from PyQt6.QtWidgets import (
     QApplication,
@@ -45,7 +49,11 @@ translation = gettext.translation("pywebsearch", locales_dir, fallback=True)
 translation.install()
 _ = translation.gettext
 
-VERBOSE = False
+
+class LaunchSignals(QObject):
+    """Carries results of background launches back to the GUI thread."""
+
+    failed = pyqtSignal(str, str)
 
 
 class PyWebSearchUI(QMainWindow):
@@ -100,15 +108,32 @@ class PyWebSearchUI(QMainWindow):
         self.search_input.returnPressed.connect(self.handle_input)
         main_layout.addWidget(self.search_input)
 
+        # Up/Down walk the live history; nothing is copied or reloaded
         self.history_manager = self.settings.history
-        self.history_list = self.history_manager.read_history()
-        self.history_index = -1
+        self.history_cursor = self.history_manager.cursor()
+
+        # Inline completion from history and aliases, ranked by frecency.
+        # The index is built in the background and then kept up to date.
+        self.completer = HistoryCompleter(self.history_manager, self.app.aliases)
+        self.completer.refresh()
+        self.completion_snapshot = self.app.snapshot
+        self.typed_text = ""
+        self.search_input.textEdited.connect(self.complete_inline)
+
+        # Searches launch on a worker thread; outcomes come back as signals
+        self.launch_signals = LaunchSignals(self)
+        self.launch_signals.failed.connect(self.on_search_failed)
 
         main_widget.setLayout(main_layout)
 
         shortcut = QShortcut(QKeySequence("F5"), self)
         shortcut.activated.connect(self.reload_configuration)
 
+        # Pick up edits made outside the app (e.g. _edit) without F5
+        self.config_watcher = ConfigWatcher(
+            self.settings.config, self.settings.apply_config, parent=self
+        )
+
         # Added for tray icon functionality in Windows
         self.tray_icon = None
         self.is_quitting = False
@@ -146,29 +171,61 @@ class PyWebSearchUI(QMainWindow):
         if user_input in commands:
             commands[user_input]()
         else:
-            self.app.process_search(user_input, history_manager=self.settings.history)
-            # History reload
-            self.history_list = self.history_manager.read_history()
-            self.history_index = -1
+            future = self.app.process_search_async(user_input, history_manager=self.settings.history)
+            future.add_done_callback(lambda f, query=user_input: self._search_done(query, f))
+            self.history_cursor.reset()
 
         self.search_input.clear()
+        self.typed_text = ""
+
+    def complete_inline(self, text):
+        # Only complete when the user typed more, so Backspace can remove
+        # the suggestion, and only with the cursor at the end
+        typed_more = len(text) > len(self.typed_text)
+        self.typed_text = text
+        if not typed_more or self.search_input.cursorPosition() != len(text):
+            return
+        snapshot = self.app.snapshot
+        if snapshot is not self.completion_snapshot:
+            self.completion_snapshot = snapshot
+            self.completer.set_aliases(snapshot.aliases)
+        completion = self.completer.complete(text)
+        if completion:
+            # Keep what was typed and select the suggested rest: typing
+            # replaces it, Enter or End accepts it
+            self.search_input.setText(text + completion[len(text):])
+            self.search_input.setSelection(len(text), len(completion) - len(text))
+
+    def _search_done(self, query, future):
+        # Runs on the worker thread: only emit, Qt queues it to the GUI thread
+        error = future.exception()
+        if error is not None:
+            self.launch_signals.failed.emit(query, str(error))
+
+    def on_search_failed(self, query, message):
+        self.settings.dialogs.show_message_box(
+            _("❌ Could not launch: ") + f"{query}\n\n{message}",
+            _("Error"),
+            icon=self.settings.dialogs.Icon.Critical,
+        )
 
     def keyPressEvent(self, event):
         # 1. History navigation (Up/Down keys)
         if event.key() == Qt.Key.Key_Up:
-            if self.history_index < len(self.history_list) - 1:
-                self.history_index += 1
-                self.search_input.setText(self.history_list[~self.history_index])
+            entry = self.history_cursor.older()
+            if entry is not None:
+                self.search_input.setText(entry)
+                self.typed_text = entry
             event.accept()
             return
 
         if event.key() == Qt.Key.Key_Down:
-            self.history_index -= 1
-            if self.history_index >= 0:
-                self.search_input.setText(self.history_list[~self.history_index])
+            entry = self.history_cursor.newer()
+            if entry is not None:
+                self.search_input.setText(entry)
             else:
-                self.history_index = -1
                 self.search_input.clear()
+            self.typed_text = self.search_input.text()
             event.accept()
             return
 
@@ -176,7 +233,8 @@ class PyWebSearchUI(QMainWindow):
         if event.key() == Qt.Key.Key_Escape:
             if self.search_input.text():
                 self.search_input.clear()
-                self.history_index = -1  # Reset history position when clearing
+                self.typed_text = ""
+                self.history_cursor.reset()  # Reset history position when clearing
                 event.accept()
                 return
 
@@ -248,33 +306,7 @@ class PyWebSearchUI(QMainWindow):
                     menu.addAction(action)
 
 
-def main():
-    global VERBOSE
-    if len(sys.argv) > 1 and sys.argv[1] in ("--help", "-h"):
-        print(
-            _(
-                """pywebsearch - Custom web search tool
-Usage:
-pywebsearch [options] [query]
-
-Options:
---help, -h            Show this help and exit.
---verbose             Verbose mode (show executed commands).
-
-Examples:
-pywebsearch --help
-pywebsearch '!g mechanical keyboard'
-pywebsearch '>github.com'
-pywebsearch 'g:cockatoo'
-"""
-            )
-        )
-        sys.exit(0)
-
-    if len(sys.argv) > 1 and sys.argv[1] == "--verbose":
-        VERBOSE = True
-        sys.argv.pop(1)
-
+def run_gui(verbose=False):
     current_platform = sys.platform
     if current_platform.startswith("linux"):
         from pywebsearch.linux import LinuxHelper as platform_mod
@@ -286,28 +318,32 @@ pywebsearch 'g:cockatoo'
     # User config path determined via platformdirs for cross-platform compatibility
     config_dir = user_config_dir("pywebsearch", appauthor="dmnmsc", ensure_exists=True)
     conf_path = os.path.join(config_dir, "pywebsearch.conf")
-    from pywebsearch.config import ConfigHandler
+    from pywebsearch.core.config import ConfigHandler
     config_handler_instance = ConfigHandler(conf_path)
 
     # Instantiate and attach config to platform helper:
     platform_helper = platform_mod()
-    platform_helper.config = config_handler_instance
+    platform_helper.attach_config(config_handler_instance)
 
     # --- Single Instance Check ---
     if platform_helper.check_single_instance():
         platform_helper.send_activation_message()
         sys.exit(0)
+    platform_helper.refresh_browsers()
 
-    app = QApplication(sys.argv)
+    with trace.span("qt.init"):
+        app = QApplication(sys.argv)
     app.setApplicationName("pywebsearch")
     app.setApplicationDisplayName("PyWebSearch")
     app.setDesktopFileName("pywebsearch")
 
-    pyweb_app = PyWebSearchApp(platform_module=platform_helper)
+    pyweb_app = PyWebSearchApp(platform_module=platform_helper, dialogs=Dialogs())
     pyweb_app.platform_helper = platform_helper
+    pyweb_app.verbose = verbose
     settings = SettingsManager(pyweb_app, version=VERSION)
 
-    main_window = PyWebSearchUI(settings)
+    with trace.span("window"):
+        main_window = PyWebSearchUI(settings)
     platform_helper.main_window = main_window
 
     tray_icon = None
@@ -317,13 +353,17 @@ pywebsearch 'g:cockatoo'
             main_window.tray_icon = tray_icon
 
     main_window.show()
+    exit_code = app.exec()
+    # Let launches still queued on the worker finish before exiting
+    pyweb_app.shutdown()
+    sys.exit(exit_code)
 
-    if len(sys.argv) > 1:
-        pyweb_app.process_search(
-            " ".join(sys.argv[1:]), history_manager=settings.history
-        )
-        sys.exit(0)
-    sys.exit(app.exec())
+
+def main():
+    # Queries given on the command line never need the GUI; the
+    # command line handling lives in the Qt-free cli module.
+    from pywebsearch.cli import main as cli_main
+    cli_main()
 
 
 if __name__ == "__main__":
@@ -1,15 +1,13 @@
 #!/usr/bin/env python3
 import os
-import subprocess
 import sys
 import shlex
 import re
 import gettext
-from pywebsearch.platform_base import PlatformHelper
-from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QApplication
-from PyQt6.QtGui import QIcon, QAction
-from PyQt6.QtNetwork import QLocalServer, QLocalSocket
-from PyQt6.QtCore import QByteArray, Qt
+from pywebsearch.core.platform_base import PlatformHelper
+
+# PyQt6 is imported inside the methods that need it so that headless
+# command line use never loads Qt.
 
 _ = gettext.gettext
 
@@ -35,6 +33,8 @@ def resource_path(relative_path):
 
 
 def get_icon():
+    from PyQt6.QtGui import QIcon
+
     icon_rel_name = "pywebsearch.ico"
     icon_path = resource_path(icon_rel_name)
     if os.path.exists(icon_path):
@@ -51,9 +51,10 @@ class WindowsHelper(PlatformHelper):
     """
 
     def __init__(self):
-        # Initialize browser map with detected browsers
+        # Start from the browsers detected last run; long-running front ends
+        # refresh it with refresh_browsers()
         self.browser_map = self._detect_browsers()
-        self.config = None  # Assigned externally if needed
+        self.config = None  # Attached externally with attach_config()
         self.aliases = {}
         self.single_instance_server = None
         self.main_window = None
@@ -101,43 +102,42 @@ class WindowsHelper(PlatformHelper):
 
     def _detect_browsers(self):
         """
-        Detect installed browsers using the 'browsers' package.
-        Returns a dict mapping lowercase browser names to their executable paths.
-        Falls back to extra browsers from config if package missing.
+        Return the browser map saved by the previous run (entries whose
+        executable changed are dropped). Only when there is no saved map yet
+        is a background detection started here, so one-off CLI queries do
+        not pay for it. Extra browsers from config are merged in.
         """
-        try:
-            import browsers
-        except ImportError:
-            # Fallback to extra browsers from config if available
-            if hasattr(self, 'config') and self.config and hasattr(self.config, 'get_extra_browsers'):
-                ext = self.config.get_extra_browsers()
-                return {b.lower(): b for b in ext}
-            return {}
-
-        browsers_map = {}
-        for b in browsers.browsers():
-            name = (
-                b.get("browser_type")
-                or b.get("display_name")
-                or b.get("name")
-            )
-            path = b.get("path") or b.get("location")
+        browsers_map = dict(self.browser_cache.load())
+        self._merge_extra_browsers(browsers_map)
+        if not os.path.exists(self.browser_cache.path):
+            self.refresh_browsers()
+        return browsers_map
+
+    def refresh_browsers(self):
+        """
+        Detect the installed browsers with the 'browsers' package in the
+        background and swap in the fresh map when it finishes.
+        """
+        if self.browser_cache.refreshing():
+            return
+        self.browser_cache.refresh_async(self._browsers_detected)
 
-            if name and path and os.path.isfile(path):
-                browsers_map[name.lower()] = path
+    def _browsers_detected(self, detected):
+        browsers_map = dict(detected)
+        self._merge_extra_browsers(browsers_map)
+        # A single assignment: launches see either the old or the new map
+        self.browser_map = browsers_map
 
-        # Add extra browsers set in config, avoid duplicates
-        if hasattr(self, "config") and self.config:
-            try:
-                extra = self.config.get_extra_browsers()
-                for ex in extra:
-                    ex_lower = ex.lower()
-                    if ex_lower not in browsers_map:
-                        browsers_map[ex_lower] = ex
-            except Exception:
-                pass
+    def _merge_extra_browsers(self, browsers_map):
+        for ex in self.extra_browsers:
+            ex_lower = ex.lower()
+            if ex_lower not in browsers_map:
+                browsers_map[ex_lower] = ex
 
-        return browsers_map
+    def apply_config(self, snapshot):
+        super().apply_config(snapshot)
+        # The map is detected before a config is attached; add imported browsers now
+        self._merge_extra_browsers(self.browser_map)
 
     def detect_available_browsers(self):
         """
@@ -179,12 +179,8 @@ class WindowsHelper(PlatformHelper):
                 print("[WindowsHelper] 'browsers' module not installed.")
                 return set()
 
-            for browser in browsers.browsers():
-                exe = (
-                    browser.get("browser_type")
-                    or browser.get("display_name")
-                    or browser.get("name")
-                )
+            # Reuse the startup detection instead of enumerating again
+            for exe in self.browser_cache.current():
                 if exe and self.is_browser_name_safe(exe):
                     exe_name = exe if exe.endswith(".exe") else exe + ".exe"
                     if exe_name.lower() not in manual_detected:
@@ -222,6 +218,9 @@ class WindowsHelper(PlatformHelper):
 
         # Resolve short name to absolute path if possible
         path_to_exec = self.browser_map.get(exec_path_lower, exec_path)
+        if not os.path.isabs(path_to_exec):
+            # Cached PATH lookup honouring PATHEXT; lets us avoid shell=True
+            path_to_exec = self.browser_registry.which(path_to_exec) or path_to_exec
 
         # Temporarily add executable directory to PATH to help subprocess find it
         browser_dir = os.path.dirname(path_to_exec)
@@ -241,13 +240,13 @@ class WindowsHelper(PlatformHelper):
                 print(f"[Windows] Launching browser command: {final_cmd} | is_abs_path: {is_abs_path}")
 
             if is_abs_path:
-                subprocess.Popen(final_cmd, shell=False)
+                self.supervisor.spawn(final_cmd, verbose=verbose)
             else:
                 # Compose command string with quoting for shell use
                 cmd_str = " ".join(f'"{arg}"' if " " in arg else arg for arg in final_cmd)
                 if verbose:
                     print(f"[Windows] Launching browser with shell=True command: {cmd_str}")
-                subprocess.Popen(cmd_str, shell=True)
+                self.supervisor.spawn(cmd_str, shell=True, verbose=verbose)
             return True
         except Exception as e:
             if verbose:
@@ -274,7 +273,7 @@ class WindowsHelper(PlatformHelper):
         if not browser_str:
             if verbose:
                 print("[Windows] No browser configured, using system default browser")
-            subprocess.Popen(f'start "" "{url}"', shell=True)
+            self.supervisor.spawn(f'start "" "{url}"', shell=True)
             return
 
         parts = shlex.split(browser_str)
@@ -299,31 +298,45 @@ class WindowsHelper(PlatformHelper):
             print(f"[Windows] Fallback launching URL with command list: {cmd_list}")
 
         try:
-            subprocess.Popen(cmd_list)
+            self.supervisor.spawn(cmd_list)
         except Exception as e:
             if verbose:
                 print(f"[Windows] Error launching URL by subprocess: {e}")
-            subprocess.Popen(f'start "" "{url}"', shell=True)
+            self.supervisor.spawn(f'start "" "{url}"', shell=True)
 
-    def read_default_browser_from_config(self):
+    def launch_urls(self, urls, browser=None, verbose=False):
         """
-        Read the 'default_browser' setting from the pywebsearch.conf file.
+        Open several URLs with one invocation of the given or configured
+        browser (`chrome.exe url1 url2`). Without a browser each URL goes to
+        the system default.
         """
-        if not self.config:
-            return ""
+        browser_str = browser or self.read_default_browser_from_config()
+        if not browser_str or len(urls) == 1:
+            for url in urls:
+                self.launch_url(url, browser=browser, verbose=verbose)
+            return
 
-        config_dir, _ = self.get_platform_dirs()
-        conf_path = os.path.join(config_dir, "pywebsearch.conf")
+        exec_path, args = self.get_default_browser_command(browser_str)
+        if not os.path.isabs(exec_path):
+            exec_path = self.browser_registry.which(exec_path) or exec_path
+        cmd_list = [exec_path] + args + list(urls)
+        if verbose:
+            print(f"[Windows] Launching {len(urls)} URLs with command list: {cmd_list}")
+        try:
+            self.supervisor.spawn(cmd_list, verbose=verbose)
+        except Exception as e:
+            if verbose:
+                print(f"[Windows] Error launching URLs together: {e}")
+            for url in urls:
+                self.launch_url(url, browser=browser, verbose=verbose)
 
-        if not os.path.exists(conf_path):
+    def read_default_browser_from_config(self):
+        """
+        Return the 'default_browser' setting of the attached config.
+        """
+        if not self.config:
             return ""
-
-        with open(conf_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("default_browser="):
-                    return line.split("=", 1)[1].strip().strip('"')
-        return ""
+        return self.default_browser
 
     def launch_default_system_url(self, url, verbose=False):
         """
@@ -331,7 +344,7 @@ class WindowsHelper(PlatformHelper):
         """
         if verbose:
             print(f"[Windows] Launching system default browser with URL: {url}")
-        subprocess.Popen(f'start "" "{url}"', shell=True)
+        self.supervisor.spawn(f'start "" "{url}"', shell=True)
 
     def launch_alias_command(self, command_line, verbose=False):
         parts = shlex.split(command_line)
@@ -352,7 +365,7 @@ class WindowsHelper(PlatformHelper):
             print(f"[Windows] Launching alias command list: {cmd_list}")
 
         try:
-            subprocess.Popen(cmd_list, shell=False)
+            self.supervisor.spawn(cmd_list)
             return True
         except Exception as e:
             if verbose:
@@ -362,7 +375,7 @@ class WindowsHelper(PlatformHelper):
                 start_cmd = f'start "" {command_line}'
                 if verbose:
                     print(f"[Windows] Fallback launching alias command with start: {start_cmd}")
-                subprocess.Popen(start_cmd, shell=True)
+                self.supervisor.spawn(start_cmd, shell=True)
                 return True
             except Exception as e2:
                 if verbose:
@@ -370,6 +383,9 @@ class WindowsHelper(PlatformHelper):
                 return False
 
     def init_tray_icon(self, main_window):
+        from PyQt6.QtWidgets import QSystemTrayIcon, QMenu
+        from PyQt6.QtGui import QAction
+
         tray_icon = QSystemTrayIcon(main_window.windowIcon(), parent=main_window)
         menu = QMenu()
 
@@ -403,6 +419,8 @@ class WindowsHelper(PlatformHelper):
         return tray_icon
 
     def check_single_instance(self):
+        from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
         server_name = "PyWebSearchInstance"
         socket = QLocalSocket()
         socket.connectToServer(server_name)
@@ -419,6 +437,8 @@ class WindowsHelper(PlatformHelper):
         return False
 
     def handle_new_connection(self):
+        from PyQt6.QtWidgets import QApplication
+
         socket = self.single_instance_server.nextPendingConnection()
         if not socket:
             return
@@ -436,6 +456,9 @@ class WindowsHelper(PlatformHelper):
         socket.disconnectFromServer()
 
     def send_activation_message(self):
+        from PyQt6.QtNetwork import QLocalSocket
+        from PyQt6.QtCore import QByteArray
+
         socket = QLocalSocket()
         socket.connectToServer("PyWebSearchInstance")
         if socket.waitForConnected(1000):
@@ -445,6 +468,8 @@ class WindowsHelper(PlatformHelper):
             socket.close()
 
     def handle_key_press_event(self, main_window, event):
+        from PyQt6.QtCore import Qt
+
         if event.key() == Qt.Key.Key_Q and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
             main_window.is_quitting = True
             main_window.close()
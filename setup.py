@@ -19,7 +19,9 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "pywebsearch = pywebsearch.main:main"
+            "pywebsearch = pywebsearch.cli:main",
+            "pywebsearchd = pywebsearch.daemon:main",
+            "pywebsearch-send = pywebsearch.client:main",
         ]
     },
     include_package_data=True,
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Measure the cost of the offline !bang index: one-off build time, the time it
+adds to startup (BangIndex.open) and per-query resolution time.
+
+Usage: bench_bangs.py [bangs.json]
+Without an argument a synthetic 13k-entry list is generated.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pywebsearch.core.bangs import BANGS_FILE, BangIndex  # noqa: E402
+
+
+def synthetic_bangs(count=13000):
+    bangs = [{"t": "w", "d": "en.wikipedia.org", "s": "Wikipedia",
+              "u": "https://en.wikipedia.org/wiki/Special:Search?search={{{s}}}"}]
+    for i in range(count - 1):
+        bangs.append({"t": f"b{i:05d}", "d": f"site{i}.example", "s": f"Site {i}",
+                      "u": f"https://site{i}.example/search?q={{{{{{s}}}}}}"})
+    return bangs
+
+
+def main():
+    with tempfile.TemporaryDirectory() as data_dir:
+        target = os.path.join(data_dir, BANGS_FILE)
+        if len(sys.argv) > 1:
+            shutil.copy(sys.argv[1], target)
+        else:
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(synthetic_bangs(), f)
+
+        start = time.perf_counter()
+        index = BangIndex.open(data_dir)
+        print(f"first open (builds index): {(time.perf_counter() - start) * 1000:8.2f} ms, {len(index)} bangs")
+        index.close()
+
+        number = 1000
+        t = timeit.timeit(lambda: BangIndex.open(data_dir), number=number)
+        print(f"startup cost (open):       {t / number * 1e6:8.2f} us")
+
+        t = timeit.timeit(lambda: BangIndex.open(data_dir).resolve("!w solar energy"), number=number)
+        print(f"open + first resolve:      {t / number * 1e6:8.2f} us")
+
+        index = BangIndex.open(data_dir)
+        number = 100000
+        t = timeit.timeit(lambda: index.resolve("!w solar energy"), number=number)
+        print(f"resolve known bang:        {t / number * 1e6:8.2f} us")
+        t = timeit.timeit(lambda: index.resolve("!nope solar energy"), number=number)
+        print(f"resolve unknown bang:      {t / number * 1e6:8.2f} us")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Compare the cold-start time of a command line query through the headless
+path (pywebsearch.cli) against the previous GUI path (QApplication,
+SettingsManager, main window, then process_search).
+
+Each run is a fresh interpreter using a throwaway config/data directory.
+Browser launching is replaced by a no-op so nothing is actually opened.
+
+Usage: bench_cli_startup.py [runs] [query]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NO_LAUNCH = """
+from pywebsearch.core.search import PyWebSearchApp
+PyWebSearchApp.launch_url = lambda self, url, browser=None: None
+"""
+
+HEADLESS = NO_LAUNCH + """
+import sys
+from pywebsearch import cli
+cli.run_query(sys.argv[1])
+assert "PyQt6" not in sys.modules, "headless path imported PyQt6"
+"""
+
+GUI = NO_LAUNCH + """
+import sys
+from PyQt6.QtWidgets import QApplication
+from pywebsearch.main import PyWebSearchUI, VERSION
+from pywebsearch.app_settings import SettingsManager
+from pywebsearch.dialogs import Dialogs
+from pywebsearch.linux import LinuxHelper
+
+app = QApplication(sys.argv[:1])
+platform_helper = LinuxHelper()
+pyweb_app = PyWebSearchApp(platform_module=platform_helper, dialogs=Dialogs())
+pyweb_app.platform_helper = platform_helper
+settings = SettingsManager(pyweb_app, version=VERSION)
+main_window = PyWebSearchUI(settings)
+main_window.show()
+pyweb_app.process_search(sys.argv[1], history_manager=settings.history)
+"""
+
+
+def time_run(code, query, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code, query], env=env, check=True, cwd=REPO_DIR)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    query = sys.argv[2] if len(sys.argv) > 2 else "g:foo"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["XDG_CONFIG_HOME"] = os.path.join(tmp, "config")
+        env["XDG_DATA_HOME"] = os.path.join(tmp, "data")
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        env["PYTHONPATH"] = REPO_DIR + os.pathsep + env.get("PYTHONPATH", "")
+
+        # Warm the filesystem cache and create the default config once
+        time_run(HEADLESS, query, env)
+
+        for label, code in (("headless", HEADLESS), ("gui", GUI)):
+            samples = [time_run(code, query, env) for _ in range(runs)]
+            print(
+                f"{label:>9}: median {statistics.median(samples):7.1f} ms  "
+                f"min {min(samples):7.1f} ms  max {max(samples):7.1f} ms  ({runs} runs)"
+            )
+
+
+if __name__ == "__main__":
+    main()
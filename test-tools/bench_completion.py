@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Measure inline completion on a large history: building the frecency index
+(done once, in the background), recording a search, and the completion
+asked for on each keystroke while typing queries, from a cold cache.
+
+Usage: bench_completion.py [entries]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pywebsearch.core.completion import HistoryCompleter  # noqa: E402
+from pywebsearch.core.history import HistoryManager  # noqa: E402
+
+WORDS = ("python", "linux", "keyboard", "solar", "rust", "recipe", "weather", "kernel",
+         "guitar", "espresso", "bicycle", "docker", "lisbon", "quantum", "garden", "chess")
+ALIASES = ("g", "so", "w", "gh", "yt")
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, "pywebsearch_history")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(entries):
+                f.write(f"{rng.choice(ALIASES)}:{' '.join(rng.sample(WORDS, 2))} {i}\n")
+        history = HistoryManager(path)
+        history.read_history()
+        completer = HistoryCompleter(history, ALIASES)
+        print(f"history with {entries} entries")
+
+        start = time.perf_counter()
+        completer.prepare()
+        print(f"build index:              {(time.perf_counter() - start) * 1000:10.2f} ms")
+
+        number = 200
+        start = time.perf_counter()
+        for i in range(number):
+            history.add_entry(f"g:{rng.choice(WORDS)} new {i}")
+        print(f"add_entry + use():        {(time.perf_counter() - start) / number * 1e6:10.2f} us")
+
+        times = []
+        for query in ("g:linux kernel", "so:python docker", "w:lisbon", "yt:guitar solar 12", "quantum"):
+            for n in range(1, len(query) + 1):
+                start = time.perf_counter()
+                completer.complete(query[:n])
+                times.append(time.perf_counter() - start)
+        times.sort()
+        print(f"keystroke, median:        {times[len(times) // 2] * 1e6:10.2f} us")
+        print(f"keystroke, worst:         {times[-1] * 1e6:10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
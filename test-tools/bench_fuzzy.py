@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Measure the fuzzy matcher behind the selection dialogs: adding the
+candidates (the per-item preprocessing), then the latency of each
+keystroke while typing queries into a list of candidates, where every
+keystroke after the first narrows the previous matches.
+
+Usage: bench_fuzzy.py [candidates]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pywebsearch.core.fuzzy import FuzzyMatcher  # noqa: E402
+
+WORDS = ("python", "linux", "keyboard", "solar", "rust", "recipe", "weather", "kernel",
+         "guitar", "espresso", "bicycle", "docker", "lisbon", "quantum", "garden", "chess")
+ALIASES = ("g", "so", "w", "gh", "yt", "")
+QUERIES = ("gh docker", "lnxkrn", "so:py", "quantum garden 4", "zzz")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(42)
+    items = []
+    for i in range(count):
+        alias = rng.choice(ALIASES)
+        words = " ".join(rng.sample(WORDS, 3))
+        items.append(f"{alias}:{words} {i}" if alias else f"{words} {i}")
+
+    start = time.perf_counter()
+    matcher = FuzzyMatcher(items)
+    print(f"{count} candidates, preprocessing: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    for query in QUERIES:
+        times = []
+        for n in range(1, len(query) + 1):
+            start = time.perf_counter()
+            matches = matcher.match(query[:n])
+            times.append((time.perf_counter() - start) * 1000)
+        best = items[matches[0]] if matches else "-"
+        keystrokes = " ".join(f"{t:.1f}" for t in times)
+        print(f"{query!r:20} {len(matches):6} matches, best {best!r}")
+        print(f"{'':20} ms per keystroke: {keystrokes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Measure HistoryManager.add_entry on a large history file: the previous
+implementation (read and strip the whole file on every search to check for
+duplicates) against the in-memory index, for a new entry and a repeated
+one. Also times the first load of the index, picking up lines appended by
+another process, and what the GUI does with the history: the full
+read_history() copy it used to take after every search against a step of
+the Up/Down cursor and a page of recent entries.
+
+Usage: bench_history.py [entries] [iterations]
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pywebsearch.core.history import HistoryManager  # noqa: E402
+
+
+def legacy_add_entry(path, entry):
+    entry = entry.strip()
+    with open(path, "r", encoding="utf-8") as f:
+        history = [line.strip() for line in f if line.strip()]
+    if entry in history:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(entry + "\n")
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, "pywebsearch_history")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(entries):
+                f.write(f"g:search number {i}\n")
+
+        print(f"history with {entries} entries, {number} searches")
+        t = timeit.timeit(lambda: legacy_add_entry(path, "g:search number 5"), number=number)
+        print(f"repeated, re-read file:   {t / number * 1e6:10.2f} us")
+        counter = iter(range(10 ** 9))
+        t = timeit.timeit(lambda: legacy_add_entry(path, f"new legacy {next(counter)}"), number=number)
+        print(f"new entry, re-read file:  {t / number * 1e6:10.2f} us")
+
+        start = time.perf_counter()
+        history = HistoryManager(path)
+        history.read_history()
+        print(f"first load of the index:  {(time.perf_counter() - start) * 1e6:10.2f} us")
+
+        t = timeit.timeit(lambda: history.add_entry("g:search number 5"), number=number)
+        print(f"repeated, index:          {t / number * 1e6:10.2f} us")
+        t = timeit.timeit(lambda: history.add_entry(f"new indexed {next(counter)}"), number=number)
+        print(f"new entry, index:         {t / number * 1e6:10.2f} us")
+
+        def foreign_append():
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(f"other process {next(counter)}\n")
+            history.add_entry("g:search number 5")
+
+        t = timeit.timeit(foreign_append, number=number)
+        print(f"after foreign append:     {t / number * 1e6:10.2f} us")
+
+        t = timeit.timeit(history.read_history, number=number)
+        print(f"read_history() copy:      {t / number * 1e6:10.2f} us")
+        cursor = history.cursor()
+        t = timeit.timeit(cursor.older, number=number)
+        print(f"cursor step (Up):         {t / number * 1e6:10.2f} us")
+        t = timeit.timeit(lambda: history.recent(0, 50), number=number)
+        print(f"recent(0, 50):            {t / number * 1e6:10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
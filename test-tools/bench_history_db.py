@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Measure the SQLite history store on a large history: one-off migration of
+the text file, reopening, adding an entry, and filtering as the history
+dialog does, against a substring scan over the text history.
+
+Usage: bench_history_db.py [entries]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pywebsearch.core.history import HistoryManager  # noqa: E402
+from pywebsearch.core.history_db import SQLiteHistoryManager  # noqa: E402
+
+WORDS = ("python", "linux", "keyboard", "solar", "rust", "recipe", "weather", "kernel",
+         "guitar", "espresso", "bicycle", "docker", "lisbon", "quantum", "garden", "chess")
+ALIASES = ("g", "so", "w", "gh", "yt", "")
+
+
+def make_history(path, entries):
+    rng = random.Random(42)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(entries):
+            alias = rng.choice(ALIASES)
+            words = " ".join(rng.sample(WORDS, 3))
+            f.write(f"{alias}:{words} {i}\n" if alias else f"{words} {i}\n")
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, "pywebsearch_history")
+        make_history(path, entries)
+        print(f"history with {entries} entries")
+
+        start = time.perf_counter()
+        store = SQLiteHistoryManager(path)
+        print(f"first open (migration):   {(time.perf_counter() - start) * 1000:10.2f} ms ({store.tokenizer or 'no FTS5'})")
+        store.close()
+        start = time.perf_counter()
+        store = SQLiteHistoryManager(path)
+        print(f"reopen:                   {(time.perf_counter() - start) * 1000:10.2f} ms")
+
+        number = 200
+        counter = iter(range(10 ** 9))
+        t = timeit.timeit(lambda: store.add_entry(f"g:new entry {next(counter)}", alias="g"), number=number)
+        print(f"add_entry:                {t / number * 1e6:10.2f} us")
+        t = timeit.timeit(lambda: store.recent(0, 200), number=number)
+        print(f"recent(0, 200):           {t / number * 1e6:10.2f} us")
+
+        text = HistoryManager(path)
+        text.read_history()
+        for term in ("so", "quantum", "solar rust", "lisbon 99"):
+            number = 20
+            t = timeit.timeit(lambda: store.search(term), number=number)
+            print(f"search {term!r:14} sqlite: {t / number * 1e3:8.2f} ms", end="")
+            needle = term.lower()
+            t = timeit.timeit(
+                lambda: [e for e in text.iter_recent() if needle in e.lower()][:200], number=3
+            )
+            print(f"   text scan: {t / 3 * 1e3:8.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measure the latency PlatformHelper.launch_url adds before the browser is
+spawned: reading default_browser from pywebsearch.conf on every launch (no
+config attached, the previous behaviour) against the in-memory settings of
+an attached ConfigHandler. Spawning itself is stubbed out; the cost of one
+real fork/exec of `true` is printed for scale.
+
+It also times the browser availability check LinuxHelper runs before each
+launch: globbing every PATH directory (previous behaviour) against the
+cached BrowserRegistry.
+
+Usage: bench_launch.py [aliases] [iterations]
+"""
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pywebsearch.core.config import ConfigHandler  # noqa: E402
+from pywebsearch.core.platform_base import (  # noqa: E402
+    BROWSER_PATTERNS,
+    TEXT_BROWSERS,
+    BrowserRegistry,
+    PlatformHelper,
+)
+
+
+class BenchHelper(PlatformHelper):
+    def __init__(self, config_dir):
+        self.config_dir = config_dir
+        self.launched = 0
+
+    def get_platform_dirs(self):
+        return self.config_dir, self.config_dir
+
+    def launch_browser(self, cmd_list, verbose=False):
+        self.launched += 1
+        return True
+
+    def launch_default_system_url(self, url, verbose=False):
+        self.launched += 1
+
+
+def write_config(path, aliases):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('# Default alias\ndefault_alias=""\n\n')
+        for i in range(aliases):
+            f.write(f'a{i}="https://example.com/{i}?q=$query" #Alias {i}\n')
+        # Worst case for the old line scan: the setting after the aliases
+        f.write('default_browser="firefox --new-tab"\n')
+
+
+def legacy_is_available(name):
+    detected = set()
+    for pattern in BROWSER_PATTERNS:
+        for path_entry in os.environ.get("PATH", "").split(os.pathsep):
+            for match in glob.glob(os.path.join(path_entry, pattern)):
+                if os.access(match, os.X_OK):
+                    detected.add(os.path.basename(match))
+    for text_browser in TEXT_BROWSERS:
+        if shutil.which(text_browser):
+            detected.add(text_browser)
+    return name in detected and shutil.which(name) is not None
+
+
+def main():
+    aliases = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    url = "https://duckduckgo.com/?q=test"
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        write_config(os.path.join(config_dir, "pywebsearch.conf"), aliases)
+
+        reading = BenchHelper(config_dir)
+        attached = BenchHelper(config_dir)
+        attached.attach_config(ConfigHandler(os.path.join(config_dir, "pywebsearch.conf")))
+        assert reading.read_default_browser_from_config() == attached.read_default_browser_from_config()
+
+        print(f"config with {aliases} aliases, {number} launches")
+        t = timeit.timeit(lambda: reading.launch_url(url), number=number)
+        print(f"launch_url, read conf each time: {t / number * 1e6:9.2f} us")
+        t = timeit.timeit(lambda: attached.launch_url(url), number=number)
+        print(f"launch_url, attached config:     {t / number * 1e6:9.2f} us")
+
+    registry = BrowserRegistry()
+    browser = next(iter(registry.detect()), "firefox")
+    assert legacy_is_available(browser) == (browser in registry.detect() and registry.which(browser) is not None)
+    few = max(number // 20, 10)
+    t = timeit.timeit(lambda: legacy_is_available(browser), number=few)
+    print(f"availability, glob PATH:         {t / few * 1e6:9.2f} us")
+    t = timeit.timeit(lambda: browser in registry.detect() and registry.which(browser), number=number)
+    print(f"availability, BrowserRegistry:   {t / number * 1e6:9.2f} us")
+
+    spawn = 50
+    t = timeit.timeit(lambda: subprocess.Popen(["true"]).wait(), number=spawn)
+    print(f"for scale, spawn+wait 'true':    {t / spawn * 1e6:9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
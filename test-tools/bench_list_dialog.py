@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure the searchable list dialog's model with a small and a large
+history: opening it (first page shown) and filtering as the user types,
+one character at a time, against the previous approach of one list widget
+item per entry hidden or shown on every keystroke. Large lists are ranked on
+a worker thread: "model" is the time spent in the GUI thread, "ranked" also
+waits for the worker's results to be shown.
+
+Usage: bench_list_dialog.py [small] [large]
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QListView, QListWidget, QListWidgetItem  # noqa: E402
+
+from pywebsearch.list_model import FilterListModel  # noqa: E402
+
+WORDS = ("python", "linux", "keyboard", "solar", "rust", "recipe", "weather", "kernel")
+TYPED = "kernel"
+
+
+def make_items(count):
+    return [f"g:{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]} {i}" for i in range(count)]
+
+
+def legacy(items):
+    widget = QListWidget()
+    for item in items:
+        QListWidgetItem(item, widget)
+    for n in range(1, len(TYPED) + 1):
+        text = TYPED[:n]
+        for i in range(widget.count()):
+            item = widget.item(i)
+            item.setHidden(text.lower() not in item.text().lower())
+
+
+def model_open(items):
+    view = QListView()
+    model = FilterListModel(iter(items))
+    model.set_filter("")
+    view.setModel(model)
+    return model
+
+
+def model_typing(items):
+    model = model_open(items)
+    for n in range(1, len(TYPED) + 1):
+        model.set_filter(TYPED[:n])
+
+
+def model_ranked(app, items):
+    model = model_open(items)
+    for n in range(1, len(TYPED) + 1):
+        model.set_filter(TYPED[:n])
+        app.processEvents()
+    while model._worker is not None:
+        time.sleep(0.001)
+        app.processEvents()
+    app.processEvents()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:3]] or [100, 100000]
+    app = QApplication(sys.argv)
+
+    for size in sizes:
+        items = make_items(size)
+        number = 20
+        t = timeit.timeit(lambda: model_open(items), number=number)
+        print(f"{size:>7} entries  open, model:          {t / number * 1e3:8.3f} ms")
+        t = timeit.timeit(lambda: model_typing(items), number=number)
+        print(f"{size:>7} entries  type {TYPED!r}, model:  {t / number * 1e3:8.3f} ms")
+        t = timeit.timeit(lambda: model_ranked(app, items), number=number)
+        print(f"{size:>7} entries  type {TYPED!r}, ranked: {t / number * 1e3:8.3f} ms")
+        number = 1 if size > 10000 else 20
+        t = timeit.timeit(lambda: legacy(items), number=number)
+        print(f"{size:>7} entries  type {TYPED!r}, widget: {t / number * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
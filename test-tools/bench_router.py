@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Measure query resolution time of the compiled QueryRouter against the
+previous per-search template handling (strip, re.sub on $query, shlex.split).
+
+Usage: bench_router.py [iterations]
+"""
+import os
+import re
+import shlex
+import sys
+import timeit
+from urllib.parse import quote_plus
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pywebsearch.core.router import QueryRouter  # noqa: E402
+
+ALIASES = {
+    "g": {"cmd": "https://www.google.com/search?q=$query", "desc": "Google"},
+    "w": {"cmd": "https://en.wikipedia.org/wiki/Special:Search?search=$query", "desc": "Wikipedia"},
+    ".y": {
+        "cmd": "chromium --incognito 'https://www.youtube.com/results?search_query=$query'",
+        "desc": "YouTube (incognito)",
+    },
+}
+
+QUERIES = ["g:mechanical keyboard", ".y:linux tutorial", "!w solar energy", ">github.com", "@w:Linux"]
+
+
+def legacy_expand(key, query):
+    cmd = re.sub(r"\$query", quote_plus(query), ALIASES[key]["cmd"].strip('"'))
+    if cmd.startswith(("http://", "https://")):
+        return cmd, None
+    return cmd, shlex.split(cmd)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    router = QueryRouter(ALIASES)
+
+    for query in QUERIES:
+        t = timeit.timeit(lambda: router.resolve(query), number=number)
+        print(f"router.resolve {query!r:28} {t / number * 1e6:6.2f} us")
+
+    for key, query in (("g", "mechanical keyboard"), (".y", "linux tutorial")):
+        old = timeit.timeit(lambda: legacy_expand(key, query), number=number)
+        new = timeit.timeit(lambda: router.expand_alias(key, query), number=number)
+        print(f"expand {key!r:5} legacy {old / number * 1e6:6.2f} us  compiled {new / number * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()